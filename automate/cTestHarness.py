@@ -25,18 +25,40 @@
 # Basic imports
 import sys, os
 import getopt
+import platform
+import subprocess
 import shutil
 from zipfile import ZipFile
+from functools import partial
 
 # Project imports
 from automate import config
 from automate.help import printHelp
 from automate.testconfigs.cHarnessConfiguration import *
 from automate.testsuite.cTestSuite import *
+from automate.testsuite.cTestScheduler import cTestScheduler
 from automate.tools.cVisTex import *
 from automate.tools.cVisConsole import *
 from automate.tools.cVisLogFile import *
 from automate.tools.cIssueGitLab import *
+from automate.tools.cStaging import cStaging
+from automate.tools.cPerformanceDatabase import cPerformanceDatabase
+
+# Executes a single test suite: solve, import, filter and verify
+# Defined on module level to be callable from worker processes
+def executeTestSuite(suite, pathSeparator, cpuset=None):
+    config.pathSeparator = pathSeparator    # not inherited by spawned worker processes
+    if cpuset is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpuset)     # inherited by the solver and mpirun
+        os.environ['OMP_NUM_THREADS'] = str(len(cpuset))
+    suite.performSystemUnderTest()  # Conducts the execution of SUT
+    if suite.systemUnderTestCheckPassed:
+        suite.analyzeSystemTarget()  # Analyze the target (execution is not done)
+        suite.filterTest()  # Filters the results according to available input output
+
+    suite.verifyTest()  # Performs the verification and calculates the error
+    suite.releaseSolutionData()  # Solution fields are not needed for reporting
+    return suite
 
 # Test Harness: Is a class for creating the required harness for conduting a number of tests automatically
 # Author: Harikrishnan Sreekumar
@@ -50,12 +72,13 @@ class cTestHarness():
         self.testsuites = None                          # List of test cases to be tested in the harness
         self.configuration = cHarnessConfiguration()    # Object for the harness configuration
         self.setProfileBasicConfigurations()            # By default: load the basic configuration file to the harness
-        self.testing = ['correctness','performance']    # defines the test types to be executed
+        self.testing = ['correctness','performance','memory']    # defines the test types to be executed
         self.disabledTestsuits=[]
         self.benchmarksDir = None
         self.issueGitRepos = None
         self.issueGitReposProjectID = None
         self.issueGitLocaReposDirectory = None
+        self.staging = cStaging()                       # stages the benchmarks into the output folder
         
     # Sets the basic configuration from file
     # Author: Harikrishnan Sreekumar
@@ -69,7 +92,7 @@ class cTestHarness():
     # Date: 01.04.2019
     def setProfileConsoleConfigurations(self, argv):
         try:
-            opts, args = getopt.getopt(argv,'o:c:t:srkp:g:b:d:i:m:',['ofolder=','path','testing='])
+            opts, args = getopt.getopt(argv,'o:c:t:srkp:g:b:d:i:m:j:x:y:',['ofolder=','path','testing='])
         except getopt.GetoptError:
             print('ERROR! Passed arguments contain error or are incomplete')
             printHelp()
@@ -107,8 +130,12 @@ class cTestHarness():
                     self.testing=['performance']
                     self.configuration.boolRunCorrectnessTests = False
                     self.configuration.boolRunPerformanceTests = True
+                elif arg=='mem':
+                    self.testing=['memory']
+                    self.configuration.boolRunCorrectnessTests = False
+                    self.configuration.boolRunPerformanceTests = True
                 elif arg=='all':
-                    self.testing=['correctness','performance']
+                    self.testing=['correctness','performance','memory']
                     self.configuration.boolRunCorrectnessTests = True
                     self.configuration.boolRunPerformanceTests = True
                 else:
@@ -124,6 +151,17 @@ class cTestHarness():
                 self.issueGitLocaReposDirectory = arg
             elif opt in ("-m"):
                 self.configuration.mpiPath = arg
+            elif opt in ("-j"):
+                try:
+                    self.configuration.numParallelJobs = int(arg)
+                except ValueError:
+                    print('ERROR! Number of jobs must be an integer')
+                    printHelp()
+                    sys.exit(2)
+            elif opt in ("-x"):
+                self.configuration.resultCacheDirectory = os.path.abspath(arg)
+            elif opt in ("-y"):
+                self.configuration.performanceDatabase = os.path.abspath(arg)
         try:
             self.configuration.assertConfiguration()
         except:
@@ -140,7 +178,7 @@ class cTestHarness():
             # get benchmarks from cloud
             try:
                 os.system('rm *.zip*')
-                os.system('rm -r ./benchmarks')
+                os.system('rm -rf ./benchmarks')
             except:
                 pass
             if not os.path.exists('./benchmarks.zip'):
@@ -200,15 +238,13 @@ class cTestHarness():
             os.makedirs(output_folder + '/logs')
 
         for suite in self.testsuites:
-            suite.suiteConfig["dir"] = output_folder + '/calculation/' + suite.suiteConfig["name"]
-            os.system(
-                'cp -r ' + config.baseDir + config.pathSeparator + config.testSuiteFolderName + config.pathSeparator +
-                suite.suiteConfig["name"] + ' ' + output_folder + '/calculation')
+            self.createTestcaseSpecificSubdirectories(suite)
+        print('> Staging benchmarks... ' + self.staging.getSummaryString())
 
     def createTestcaseSpecificSubdirectories(self,suite):
         output_folder = self.configuration.outputDirectory + config.pathSeparator + config.outputFolderName
         suite.suiteConfig["dir"] = output_folder + '/calculation/' + suite.suiteConfig["name"]
-        os.system('cp -r ' + config.baseDir + config.pathSeparator + config.testSuiteFolderName + config.pathSeparator + suite.suiteConfig["name"] + ' ' + output_folder + '/calculation')
+        self.staging.stageDirectory(config.baseDir + config.pathSeparator + config.testSuiteFolderName + config.pathSeparator + suite.suiteConfig["name"], suite.suiteConfig["dir"])
 
     # Deploy routine for all suites
     # Author: Harikrishnan Sreekumar
@@ -235,24 +271,21 @@ class cTestHarness():
             [execute,testType] = suite.getExecutionStatusandTestType()
             if execute == 'True' and testType in self.testing:
                 self.executedTestsuits.append(suite)
-                suite.defineSystemUnderTestFromConfig(
-                    self.configuration.binaryPath)  # Based on the configuration, sets the SUT
-                suite.defineSystemTargetFromConfig()  # Based on the configuration, sets the targeted system
-                self.logConsoleCommunication.generateOpeningVisualization(suite)
-                suite.performSystemUnderTest()  # Conducts the execution of SUT
-                if suite.systemUnderTestCheckPassed:
-                    suite.analyzeSystemTarget()  # Analyze the target (execution is not done)
-                    suite.filterTest()  # Filters the results according to available input output
-
-                suite.verifyTest()  # Performs the verification and calculates the error
+            elif execute == 'False' and testType in self.testing:
+                self.disabledTestsuits.append(suite)
 
+        if self.configuration.numParallelJobs > 1:
+            self.deployTestsInParallel()
+        else:
+            for suite in self.executedTestsuits:
+                self.defineSystemsForSuite(suite)
+                self.logConsoleCommunication.generateOpeningVisualization(suite)
+                executeTestSuite(suite, config.pathSeparator)
                 self.logConsoleCommunication.generateEndingVisualization(suite)
                 self.logLogFileCommunication.generateVisualization(suite)
-
-                if not self.configuration.boolKeepFiles:  # Remove temporary files to save memory
-                    os.system('rm -r ' + suite.suiteConfig["dir"])
-            elif execute == 'False' and testType in self.testing:
-                self.disabledTestsuits.append(suite)
+                self.removeTestSuiteFiles(suite)
+        self.reportStagingSummary()
+        self.storePerformanceHistory()
         print('Starting to deploy... Finished.')
         
         print('Starting to export...')
@@ -264,6 +297,79 @@ class cTestHarness():
 
         print('Starting to export... Finished.')
     
+    # Deploy routine executing the suites concurrently in worker processes
+    # The scheduler packs correctness suites into free cores and pins performance and memory suites to exclusive cpu sets
+    def deployTestsInParallel(self):
+        for suite in self.executedTestsuits:
+            self.defineSystemsForSuite(suite)
+
+        scheduler = cTestScheduler(self.configuration.numParallelJobs)
+        scheduler.executeTestSuites(self.executedTestsuits,         # finished suites keep the order of the serial run
+                                    partial(executeTestSuite, pathSeparator=config.pathSeparator),
+                                    lambda iSuite: self.removeTestSuiteFiles(self.executedTestsuits[iSuite]))
+
+        # logs are written in the stable order of the suites
+        for suite in self.executedTestsuits:
+            self.logConsoleCommunication.generateOpeningVisualization(suite)
+            self.logConsoleCommunication.generateEndingVisualization(suite)
+            self.logLogFileCommunication.generateVisualization(suite)
+
+    # Defines the system under test and the targeted system of a suite
+    def defineSystemsForSuite(self, suite):
+        suite.defineSystemUnderTestFromConfig(
+            self.configuration.binaryPath)  # Based on the configuration, sets the SUT
+        suite.defineSystemTargetFromConfig()  # Based on the configuration, sets the targeted system
+
+    # Print the disk usage saved by linking instead of copying benchmark data
+    def reportStagingSummary(self):
+        summary = cStaging()
+        for staging in [self.staging] + [suite.systemUnderTest.staging for suite in self.executedTestsuits]:
+            summary.bytesStaged += staging.bytesStaged
+            summary.bytesSaved += staging.bytesSaved
+        print('> Staging... ' + summary.getSummaryString())
+
+    # Append the results of all executed performance and memory suites to the performance database
+    # Only suites whose binary runs all completed (exit status 0) are stored, crashed runs would distort the history
+    def storePerformanceHistory(self):
+        if self.configuration.performanceDatabase is None:
+            return
+        suites = [suite for suite in self.executedTestsuits if suite.systemUnderTestCheckPassed and
+                  (suite.testType in suite.wordingPerformance or suite.testType in suite.wordingMemory) and
+                  all([resource["exitStatus"] == 0 for resources in suite.systemUnderTest.resourceSamples for resource in resources])]
+        if len(suites) == 0:
+            return
+        metadata = {}
+        for suite in suites:
+            if suite.systemUnderTest.binaryLog is not None:
+                metadata = suite.systemUnderTest.binaryLog.metadata
+                break
+        database = cPerformanceDatabase(self.configuration.performanceDatabase)
+        runId = database.addRun(platform.node(), suites[0].systemUnderTest.binaryPath + suites[0].systemUnderTest.binary,
+                                self.getCommitId(metadata), metadata)
+        numPoints = 0
+        for suite in suites:
+            numPoints += database.addSuite(runId, suite)
+        database.close()
+        print('> Performance database... Stored ' + str(numPoints) + ' sweep points of ' + str(len(suites)) + ' testsuites in ' + self.configuration.performanceDatabase)
+
+    # Return the commit of the binary from the log metadata or the local elPaSo repository, empty if unknown
+    def getCommitId(self, metadata):
+        for (key, value) in metadata.items():
+            if key.lower() in config.performanceCommitKeys:
+                return value
+        if self.issueGitLocaReposDirectory is not None:
+            try:
+                return subprocess.run(['git', '-C', self.issueGitLocaReposDirectory, 'rev-parse', 'HEAD'],
+                                      capture_output=True, text=True, check=True).stdout.strip()
+            except (OSError, subprocess.CalledProcessError):
+                pass
+        return ''
+
+    # Remove temporary files of a suite to save memory
+    def removeTestSuiteFiles(self, suite):
+        if not self.configuration.boolKeepFiles:
+            shutil.rmtree(suite.suiteConfig["dir"], ignore_errors=True)
+
     # Report issue if requested
     # Author: Harikrishnan Sreekumar
     # Date: 28.07.2021
@@ -288,6 +394,8 @@ class cTestHarness():
                     issuemanager.setAutomateIntegrationIssue(bstringlist,buildcase)
                 elif suitetype == self.executedTestsuits[0].wordingPerformance:
                     issuemanager.setAutomatePerformanceIssue(bstringlist,buildcase)
+                elif suitetype == self.executedTestsuits[0].wordingMemory:
+                    issuemanager.setAutomateMemoryIssue(bstringlist,buildcase)
                 issuemanager.reportGitlabIssue()
             
             print('Reporting issues... done.\n')
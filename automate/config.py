@@ -7,4 +7,38 @@ testSuiteFolderName = 'benchmarks'      # name of folder containing the benchmar
 
 outputFolderName = 'outputs'            # the name of output folder
 
-logfileName = 'automate.log'            # the name of log file
\ No newline at end of file
+logfileName = 'automate.log'            # the name of log file
+
+resultCacheMaxSizeGB = 100              # result cache is evicted beyond this size in GB
+
+resultCacheMaxAgeDays = 30              # result cache entries older than this are evicted
+
+stagingMaterializePatterns = ['*.hdf5', '*.h5', '*.ini', '*.cfg', '*.log*']   # benchmark files the run writes or may write - cloned or copied, never hardlinked
+
+fullFieldChunkSteps = 64                # frequency steps compared at once in full-field comparison
+
+fullFieldChunkDofs = 65536              # dofs compared at once in full-field comparison
+
+abaqusCsvReadWorkers = 4                # threads parsing abaqus csv result files concurrently
+
+sidecarFolderName = '.automate_sidecar'  # folder below the base dir holding binary sidecars of reference data, one per absolute result path
+
+processSamplingInterval = 0.1           # seconds between resident set size samples of a running solver process tree
+
+elpasoLogHeadLines = 32                 # lines kept from the start of an elPaSo log (version and setup)
+
+elpasoLogTailLines = 64                 # lines kept from the end of an elPaSo log (binary info)
+
+performanceReferenceMinTime = 1e-3      # reference times in seconds below this are too short for a relative slowdown
+
+performanceCommitKeys = ['commit', 'git commit', 'git hash', 'git revision', 'revision']  # log metadata keys holding the commit of the binary
+
+performanceDatabaseTimeout = 60         # seconds to wait for a locked performance database
+
+performanceHistoryWindow = 20           # latest runs forming the rolling baseline of a sweep point
+
+performanceHistoryMinRuns = 3           # runs needed before the history is used as reference
+
+performanceHistoryZScore = 3.5          # robust z-score above the rolling baseline flagged as regression
+
+performanceChangePointWindow = 5        # runs per window of the two-window change-point test
@@ -0,0 +1,47 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import numpy as np
+
+# Lazy solution source over a complex (steps, dofs) array, e.g. a memory-mapped sidecar
+# Only the pages of the requested entries are touched for memory-mapped arrays
+class cArraySolutionSource:
+    # Constructor
+    def __init__(self, solution):
+        self.solution = solution            # complex array (steps, dofs)
+        self.shape = solution.shape
+
+    # Nothing to close, the array (or its memory map) is released with the source
+    def closeFile(self):
+        pass
+
+    # Return the complex solution of the given dofs and steps as (steps, dofs)
+    # The dofs are read in ascending order as one [steps, dofs] block and then put back into the requested order
+    def readSolution(self, dofIndices, steps):
+        if isinstance(dofIndices, slice):
+            return np.array(self.solution[steps, dofIndices], dtype=np.complex128)
+        [uniqueDofs, inverse] = np.unique(np.arange(self.shape[1])[dofIndices], return_inverse=True)
+        block = np.asarray(self.solution[steps, uniqueDofs], dtype=np.complex128)
+        return block[:, inverse]
@@ -0,0 +1,54 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import numpy as np
+
+# Index over the node column of a dof map for fast node to dof lookups
+# The node ids are sorted once, lookups use binary search
+class cDofMapIndex:
+    # Constructor
+    def __init__(self, nodeIds):
+        nodeIds = np.asarray(nodeIds).ravel()
+        self.sortedIndices = np.argsort(nodeIds, kind='stable')    # dof indices ordered by node id, ascending within a node
+        self.sortedNodeIds = nodeIds[self.sortedIndices]
+
+    # Return the dof indices of a node. Raises KeyError for unknown nodes
+    def getDofIndexListForNode(self, node):
+        first = np.searchsorted(self.sortedNodeIds, node, side='left')
+        last = np.searchsorted(self.sortedNodeIds, node, side='right')
+        if first == last:
+            raise KeyError(node)
+        return self.sortedIndices[first:last]
+
+    # Return the dof indices of several nodes in CSR format
+    # The dofs of nodes[i] are indices[offsets[i]:offsets[i+1]], unknown nodes have an empty range
+    def getDofIndexListForNodes(self, nodes):
+        nodes = np.asarray(nodes).ravel()
+        first = np.searchsorted(self.sortedNodeIds, nodes, side='left')
+        counts = np.searchsorted(self.sortedNodeIds, nodes, side='right') - first
+        offsets = np.zeros(len(nodes)+1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        positions = np.repeat(first - offsets[:-1], counts) + np.arange(offsets[-1])
+        return self.sortedIndices[positions], offsets
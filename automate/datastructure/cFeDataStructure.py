@@ -22,15 +22,90 @@
 ## Authors: Harikrishnan Sreekumar, Christopher Blech
 ## Property of : Institut für Akustik, TU Braunschweig, Germany
 
+# Basic imports
+import numpy as np
+
 # Datastructure class for FE analysis
+# The solution is kept as one complex (steps, dofs) array in double or, opt-in, single precision
+# It can be attached as a lazy source (see setSolutionSource) which is only read for the requested dofs and steps
 # Author: Harikrishnan Sreekumar
 # Date: 09.10.2020
 class cFeDataStructure:
+    __slots__ = ['nodes', 'freqSteps', 'precision', 'solution', 'solutionSource']
+
     # Constructor
     # Author: Harikrishnan Sreekumar
     # Date: 09.10.2020
-    def __init__(self):
+    def __init__(self, precision = 'double'):
         self.nodes = []
         self.freqSteps = []
-        self.solutionReal = []
-        self.solutionImag = []
+        self.precision = precision          # 'double' (complex128) or 'single' (complex64)
+        self.solution = None                # materialized complex solution (steps, dofs)
+        self.solutionSource = None          # lazy solution reader providing shape and readSolution(dofIndices, steps)
+
+    # Real part of the full solution as view, materialized from the lazy source on first access
+    @property
+    def solutionReal(self):
+        self.materializeSolution()
+        return self.solution.real
+
+    # Imaginary part of the full solution as view, materialized from the lazy source on first access
+    @property
+    def solutionImag(self):
+        self.materializeSolution()
+        return self.solution.imag
+
+    # Return the complex type of the configured precision
+    def getSolutionType(self):
+        if self.precision == 'single':
+            return np.complex64
+        return np.complex128
+
+    # Allocate a zero solution of the configured precision
+    def allocateSolution(self, numSteps, numDofs):
+        self.solution = np.zeros((numSteps, numDofs), dtype=self.getSolutionType())
+        self.solutionSource = None
+
+    # Set the complex solution (steps, dofs), converted to the configured precision
+    def setSolution(self, solution):
+        self.solution = np.asarray(solution, dtype=self.getSolutionType())
+        self.solutionSource = None
+
+    # Attach a lazy solution source instead of a materialized array
+    def setSolutionSource(self, source):
+        self.solutionSource = source
+        self.solution = None
+
+    # Check if the solution is only available through the lazy source
+    def isSolutionLazy(self):
+        return self.solutionSource is not None and self.solution is None
+
+    # Read the whole solution from the lazy source into memory, the source is closed afterwards
+    def materializeSolution(self):
+        if self.isSolutionLazy():
+            self.solution = np.asarray(self.solutionSource.readSolution(slice(None), slice(None)), dtype=self.getSolutionType())
+            self.solutionSource.closeFile()
+
+    # Close the lazy source, it is reopened on the next read
+    def closeSolutionSource(self):
+        if self.solutionSource is not None:
+            self.solutionSource.closeFile()
+
+    # Return the shape (steps, dofs) of the solution
+    def getSolutionShape(self):
+        if self.isSolutionLazy():
+            return tuple(self.solutionSource.shape)
+        return np.shape(self.solution)
+
+    # Return the number of solution steps
+    def getNumSteps(self):
+        return self.getSolutionShape()[0]
+
+    # Return the complex solution of the given dofs (columns) and steps (rows) as (steps, dofs)
+    # Only the requested entries are read from a lazy source
+    def getSolution(self, dofIndices = None, steps = None):
+        dofIndices = slice(None) if dofIndices is None else dofIndices
+        steps = slice(None) if steps is None else steps
+        if self.isSolutionLazy():
+            return np.asarray(self.solutionSource.readSolution(dofIndices, steps), dtype=self.getSolutionType())
+        return self.solution[steps][:, dofIndices]
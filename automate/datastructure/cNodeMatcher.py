@@ -0,0 +1,96 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import itertools
+import numpy as np
+
+# Spatial index for matching nodes of two meshes within a search radius
+# Target nodes are hashed into a uniform grid with the radius as cell size, a query only visits the 27 neighbouring cells
+class cNodeMatcher:
+    # Constructor
+    def __init__(self, targetNodes, radius):
+        self.targetNodes = np.asarray(targetNodes, dtype=float)[:,0:3]
+        self.radius = float(radius)
+        self.origin = self.targetNodes.min(axis=0) - self.radius
+        targetCells = self.getCells(self.targetNodes)
+        self.numCells = targetCells.max(axis=0) + 2
+        targetKeys = self.getKeys(targetCells)
+        self.sortedIndices = np.argsort(targetKeys, kind='stable')
+        self.sortedKeys = targetKeys[self.sortedIndices]
+
+    # Return the grid cell of every node
+    def getCells(self, nodes):
+        return np.floor((nodes - self.origin)/self.radius).astype(np.int64)
+
+    # Return a scalar key for every grid cell
+    def getKeys(self, cells):
+        return (cells[:,0]*self.numCells[1] + cells[:,1])*self.numCells[2] + cells[:,2]
+
+    # Match a list of source nodes to the nearest target node within the radius
+    # Returns the zero-indexed target node per source node (-1 if missing) and the number of target nodes within the radius (>1 if ambiguous)
+    def matchNodes(self, sourceNodes):
+        sourceNodes = np.atleast_2d(np.asarray(sourceNodes, dtype=float))[:,0:3]
+        sourceCells = self.getCells(sourceNodes)
+        numSource = sourceNodes.shape[0]
+
+        pairSource = []
+        pairTarget = []
+        pairDistance = []
+        for offset in itertools.product((-1, 0, 1), repeat=3):
+            queryCells = sourceCells + np.array(offset)
+            valid = np.all((queryCells >= 0) & (queryCells < self.numCells), axis=1)
+            querySource = np.nonzero(valid)[0]
+            queryKeys = self.getKeys(queryCells[valid])
+            first = np.searchsorted(self.sortedKeys, queryKeys, side='left')
+            counts = np.searchsorted(self.sortedKeys, queryKeys, side='right') - first
+            if counts.sum() == 0:
+                continue
+            # expand every source node to all target nodes in the neighbouring cell
+            candidateSource = np.repeat(querySource, counts)
+            starts = np.repeat(first - np.cumsum(counts) + counts, counts)
+            candidateTarget = self.sortedIndices[starts + np.arange(counts.sum())]
+            distance = np.linalg.norm(sourceNodes[candidateSource] - self.targetNodes[candidateTarget], axis=1)
+            within = distance <= self.radius
+            pairSource.append(candidateSource[within])
+            pairTarget.append(candidateTarget[within])
+            pairDistance.append(distance[within])
+
+        matches = -np.ones(numSource, dtype=np.int64)
+        numCandidates = np.zeros(numSource, dtype=np.int64)
+        if len(pairSource):
+            pairSource = np.concatenate(pairSource)
+            pairTarget = np.concatenate(pairTarget)
+            pairDistance = np.concatenate(pairDistance)
+            numCandidates = np.bincount(pairSource, minlength=numSource)
+            nearestFirst = np.lexsort((pairDistance, pairSource))
+            isFirst = np.ones(len(nearestFirst), dtype=bool)
+            isFirst[1:] = pairSource[nearestFirst][1:] != pairSource[nearestFirst][:-1]
+            matches[pairSource[nearestFirst][isFirst]] = pairTarget[nearestFirst][isFirst]
+        return [matches, numCandidates]
+
+    # Match a single source node. Returns the zero-indexed target node (-1 if missing) and the number of candidates
+    def matchNode(self, sourceNode):
+        [matches, numCandidates] = self.matchNodes([sourceNode])
+        return [int(matches[0]), int(numCandidates[0])]
@@ -40,12 +40,20 @@ def printHelp():
     print('-v                   -       Export additionally as .tex-file')
     print('-s                   -       Test one ore more specific testcases (preferred cases will be prompted)')
     print('-c <intel/gnu>       -      *Run in ci-pipeline mode')
-    print('-t <testType>        -       Defines the test types to be executed. corr - Correctness, per - Performance, all - for both Correctness and Performance')
-    print('                             default: both Correctness and Performance')
+    print('-t <testType>        -       Defines the test types to be executed. corr - Correctness, per - Performance, mem - Memory, all - for Correctness, Performance and Memory')
+    print('                             default: Correctness, Performance and Memory')
     print('-r                   -       If provided issues (if any are communicate to gitlab repos)')
     print('                             Option is activated only in CI env')
     print('                             default: OFF')
     print('-g <git domain url>  -       Git domain for issue reporting. eg: https://git.rz.tu-bs.de/ [use with -r]')
     print('-i <project id>      -       Git project ID. See your project Settings > General > Project ID. eg: 10  [use with -r]')
     print('-d <local git path>  -       Path to your local elPaSo git repository [use with -r]')
-    print('-m <path to mpi>     -       Path to your mpi support - required for performance tests eg: /software/openmpi/bin/mpirun')
\ No newline at end of file
+    print('-m <path to mpi>     -       Path to your mpi support - required for performance tests eg: /software/openmpi/bin/mpirun')
+    print('-j <number of jobs>  -       Number of testsuites executed concurrently in separate processes')
+    print('                             Performance and memory testsuites are pinned to exclusive cores, correctness testsuites fill the remaining cores')
+    print('                             default: 1')
+    print('-x <cache folder>    -       Reuse elPaSo results of correctness testsuites if binary, model and flags are unchanged')
+    print('-y <database file>   -       Append performance and memory results to a local SQLite history')
+    print('                             Performance testsuites with ref_performance = history are verified against it')
+    print('-benchmarkHdf5Storage -      Standalone: compares write/read throughput and file size of the hdf5 storage settings')
+    print('                             (contiguous, chunked, lzf, gzip, shuffle) on a basis matrix. Options: -n <rows> -k <cols> -r <repeat> -f <folder>')
\ No newline at end of file
@@ -30,6 +30,7 @@ from automate.help import printHelp
 from automate.cTestHarness import *
 from automate import config
 from automate.covtools import displayIntelCodCovSummary
+from automate.mod_hdf5 import mBenchmarkHdf5
 
 # Get current version of project
 # Author: Harikrishnan Sreekumar
@@ -50,6 +51,9 @@ def main(args):
     if '-displayIntelCodCovSummary' in args:
         displayIntelCodCovSummary.displayIntelCodeCov()
         sys.exit(0)
+    elif '-benchmarkHdf5Storage' in args:
+        mBenchmarkHdf5.benchmarkHdf5Storage()
+        sys.exit(0)
     else:
         print('Starting AUTOMATE...')
         # intializers
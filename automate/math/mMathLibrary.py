@@ -22,10 +22,125 @@
 ## Authors: Harikrishnan Sreekumar, Christopher Blech
 ## Property of : Institut für Akustik, TU Braunschweig, Germany
 
+import itertools
+import math
+import numpy as np
 from numpy import linalg as LA
 
 # Computes vector norm
 # Author: Harikrishnan Sreekumar
 # Date: 09.10.2020
 def computeVectorNorm(vector, order = None):
-    return LA.norm(vector, order)
\ No newline at end of file
+    return LA.norm(vector, order)
+
+# Returns the accumulation type for a precision ('double' or 'single')
+def getAccumulationType(precision):
+    if precision == 'single':
+        return np.float32
+    return np.float64
+
+# Computes the sum of squared magnitudes of every row of a real or complex 2-D array
+def computeRowSquareSum(matrix, precision = 'double'):
+    matrix = np.atleast_2d(matrix)
+    dtype = getAccumulationType(precision)
+    if np.iscomplexobj(matrix):
+        return np.einsum('ij,ij->i', matrix.real, matrix.real, dtype=dtype, casting='same_kind') + \
+               np.einsum('ij,ij->i', matrix.imag, matrix.imag, dtype=dtype, casting='same_kind')
+    return np.einsum('ij,ij->i', matrix, matrix, dtype=dtype, casting='same_kind')
+
+# Computes the L2 norm of every row of a real or complex 2-D array
+def computeRowNorm(matrix, precision = 'double'):
+    return np.sqrt(computeRowSquareSum(matrix, precision))
+
+# Computes the L2 norm of every row of a difference relative to the row norm of a reference
+def computeRelativeRowNorm(difference, reference, precision = 'double'):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return computeRowNorm(difference, precision) / computeRowNorm(reference, precision)
+
+# Computes the maximum magnitude of every row of a real or complex 2-D array
+def computeRowMaxAbs(matrix, precision = 'double'):
+    matrix = np.atleast_2d(matrix)
+    if precision == 'single':
+        matrix = matrix.astype(np.complex64 if np.iscomplexobj(matrix) else np.float32, copy=False)
+    return np.max(np.abs(matrix), axis=1, initial=0)
+
+# Computes the root mean square of every row of a real or complex 2-D array
+def computeRowRms(matrix, precision = 'double'):
+    matrix = np.atleast_2d(matrix)
+    return np.sqrt(computeRowSquareSum(matrix, precision) / max(matrix.shape[1], 1))
+
+# Computes the median, interquartile range and minimum of a sample
+def computeSampleStatistics(sample):
+    sample = np.asarray(sample, dtype=np.float64)
+    [q1, median, q3] = np.percentile(sample, [25, 50, 75])
+    return [float(median), float(q3 - q1), float(np.min(sample))]
+
+# Computes the one-sided p-value of the Mann-Whitney U test for sample being stochastically greater than reference
+# Small samples use the exact permutation distribution, larger ones the tie-corrected normal approximation
+def computeMannWhitneyPValue(sample, reference, maxExactPermutations = 20000):
+    sample = np.asarray(sample, dtype=np.float64)
+    reference = np.asarray(reference, dtype=np.float64)
+    n1 = len(sample)
+    n2 = len(reference)
+    pooled = np.concatenate([sample, reference])
+    # mid-ranks of the pooled sample (1-based)
+    order = np.argsort(pooled, kind='stable')
+    ranks = np.empty(len(pooled))
+    ranks[order] = np.arange(1, len(pooled)+1)
+    [values, inverse, counts] = np.unique(pooled, return_inverse=True, return_counts=True)
+    ranks = np.bincount(inverse, weights=ranks) / counts
+    ranks = ranks[inverse]
+    statistic = np.sum(ranks[:n1]) - n1*(n1+1)/2.0
+
+    if math.comb(n1+n2, n1) <= maxExactPermutations:
+        numGreaterEqual = 0
+        numTotal = 0
+        for combination in itertools.combinations(range(n1+n2), n1):
+            numTotal += 1
+            if np.sum(ranks[list(combination)]) - n1*(n1+1)/2.0 >= statistic - 1e-9:
+                numGreaterEqual += 1
+        return numGreaterEqual / numTotal
+
+    mean = n1*n2/2.0
+    tieCorrection = np.sum(counts**3 - counts) / ((n1+n2)*(n1+n2-1))
+    deviation = math.sqrt(n1*n2/12.0 * ((n1+n2+1) - tieCorrection))
+    if deviation == 0:
+        return 1.0
+    z = (statistic - mean - 0.5) / deviation
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+# Computes the smallest one-sided p-value the exact Mann-Whitney U test can return (every sample above every reference)
+def computeMannWhitneyMinPValue(n1, n2):
+    return 1.0 / math.comb(n1+n2, n1)
+
+# Computes the number of samples needed against n2 reference samples for the Mann-Whitney U test to reach p < alpha (0 < alpha)
+def computeMannWhitneyMinSamples(n2, alpha):
+    n1 = 1
+    while computeMannWhitneyMinPValue(n1, n2) >= alpha:
+        n1 += 1
+    return n1
+
+# Computes the median and the median absolute deviation of a sample as robust location and scale
+def computeRobustBaseline(sample):
+    sample = np.asarray(sample, dtype=np.float64)
+    median = float(np.median(sample))
+    return [median, float(np.median(np.abs(sample - median)))]
+
+# Computes the robust z-score of a value against a baseline sample (median and scaled median absolute deviation)
+def computeRobustZScore(value, sample):
+    [median, mad] = computeRobustBaseline(sample)
+    if mad == 0:
+        return 0.0 if value == median else math.copysign(math.inf, value - median)
+    return (value - median) / (1.4826*mad)
+
+# Two-window change-point test at the end of a series: the last window is tested against the window before it
+# Returns the one-sided Mann-Whitney p-value of the last window being greater and the relative shift of the medians
+def detectChangePoint(series, window):
+    series = np.asarray(series, dtype=np.float64)
+    if window < 1 or len(series) < 2*window:
+        return [1.0, 0.0]
+    recent = series[-window:]
+    previous = series[-2*window:-window]
+    previousMedian = float(np.median(previous))
+    shift = (float(np.median(recent)) - previousMedian) / previousMedian if previousMedian != 0 else 0.0
+    return [computeMannWhitneyPValue(recent, previous), shift]
@@ -0,0 +1,86 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Returns the Laplace variable s = i*omega for frequencies in Hz
+def getLaplaceVariable(freq):
+    return 2j * np.pi * np.asarray(freq, dtype=np.float64)
+
+# Evaluates H(s) = C (K + s D + s^2 M)^-1 B for a batch of frequencies with one batched solve
+# Returns an array of shape (outputs, inputs, frequencies)
+def evaluateTransferFunctionsDirect(KROM, DROM, MROM, BROM, CROM, freq):
+    s = getLaplaceVariable(freq)[:, None, None]
+    dynamicStiffness = KROM[None, :, :] + s * DROM[None, :, :] + s**2 * MROM[None, :, :]
+    response = np.linalg.solve(dynamicStiffness, np.broadcast_to(BROM, (len(freq),) + BROM.shape))
+    return np.einsum('oj,fji->oif', CROM, response)
+
+# Diagonalises the quadratic pencil once through its first order linearisation
+# E = [[I, 0], [0, M]], A = [[0, I], [-K, -D]]; (sE - A)^-1 = V (sI - Lambda)^-1 V^-1 E^-1
+# Returns the poles and the modal output and input matrices
+def computeModalRepresentation(KROM, DROM, MROM, BROM, CROM):
+    n = KROM.shape[0]
+    identity = np.eye(n)
+    zero = np.zeros((n, n))
+    E = np.block([[identity, zero], [zero, MROM]])
+    A = np.block([[zero, identity], [-KROM, -DROM]])
+    [poles, V] = np.linalg.eig(np.linalg.solve(E, A))
+    modalInput = np.linalg.solve(V, np.linalg.solve(E, np.vstack([np.zeros(BROM.shape), BROM])))
+    modalOutput = np.hstack([CROM, np.zeros(CROM.shape)]) @ V
+    return poles, modalOutput, modalInput
+
+# Evaluates H(s) = sum_k C_k B_k / (s - lambda_k) of a modal representation for a batch of frequencies
+# Returns an array of shape (outputs, inputs, frequencies)
+def evaluateTransferFunctionsModal(poles, modalOutput, modalInput, freq):
+    resolvent = 1.0 / (getLaplaceVariable(freq)[:, None] - poles[None, :])
+    return np.einsum('ok,fk,ki->oif', modalOutput, resolvent, modalInput, optimize=True)
+
+# Evaluates the transfer functions of a ROM over a frequency vector (Hz)
+# method: 'direct' - batched linear solves, 'eigen' - one eigen decomposition of the pencil (assumes a diagonalisable pencil and invertible MROM)
+# Frequencies are processed in batches of batchSize, batches are spread over numWorkers processes
+# Returns an array of shape (outputs, inputs, frequencies)
+def evaluateRomTransferFunctions(system_rom, freq, method = 'direct', batchSize = 64, numWorkers = 1):
+    freq = np.atleast_1d(np.asarray(freq, dtype=np.float64))
+    matrices = [np.asarray(system_rom[name], dtype=np.complex128) for name in ['KROM', 'DROM', 'MROM', 'BROM', 'CROM']]
+    if method == 'direct':
+        kernel = evaluateTransferFunctionsDirect
+        arguments = matrices
+    elif method == 'eigen':
+        kernel = evaluateTransferFunctionsModal
+        arguments = list(computeModalRepresentation(*matrices))
+    else:
+        print('ERROR! Unknown ROM evaluation method: ' + str(method))
+        sys.exit(-1)
+
+    batches = [freq[iStart:iStart + batchSize] for iStart in range(0, len(freq), max(1, batchSize))]
+    if numWorkers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=min(numWorkers, len(batches))) as executor:
+            results = list(executor.map(kernel, *[[argument]*len(batches) for argument in arguments], batches))
+    else:
+        results = [kernel(*arguments, batch) for batch in batches]
+    if len(results) == 0:
+        return np.zeros((matrices[4].shape[0], matrices[3].shape[1], 0), dtype=np.complex128)
+    return np.concatenate(results, axis=2)
@@ -0,0 +1,111 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+### Details: cElpasoFileResultHdf5
+
+# python imports
+import h5py
+import numpy as np
+
+class cElpasoFileResultHdf5:
+    # @brief initialization method - the result file is opened once and kept open until closeFile
+    def __init__(self, filename):
+        self.filename = filename
+        self.filehdf5 = h5py.File(self.filename, 'r')
+        self.cmptype = np.dtype([('real','float64'), ('imag','float64')])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.closeFile()
+
+    # @brief function to close the result file
+    def closeFile(self):
+        if self.filehdf5 is not None:
+            self.filehdf5.close()
+            self.filehdf5 = None
+
+    # @brief function to get the number of dofs from the dof map
+    def getNumDofs(self):
+        return self.filehdf5['/Solution/Maps/mtxDofMap'].shape[0]
+
+    # @brief function to read the node id column of the dof map
+    def readDofMapNodeIds(self):
+        dofmap = self.filehdf5['/Solution/Maps/mtxDofMap'][:]
+        if dofmap.dtype.names is not None:
+            return dofmap[dofmap.dtype.names[0]]
+        return dofmap[:,0]
+
+    # @brief function to read step values stored as attributes in the solution state
+    def readStepValues(self, keyword):
+        state = self.filehdf5['/Solution/State']
+        values = []
+        for att in state:
+            if keyword in att:
+                values.append(float(state.attrs[att]))
+        return np.array(values)
+
+    # @brief function to read the eigenvalues
+    def readEigenValues(self):
+        return self.readStepValues('EigStep')
+
+    # @brief function to read the static step values
+    def readStaticStepValues(self):
+        return self.readStepValues('StaticStep')
+
+    # @brief function to read a single solution step (one-indexed) as real and imaginary part
+    def readSolutionStep(self, step):
+        dset = self.filehdf5['/Solution/State/vecFemStep' + str(step)]
+        buffer = np.empty(dset.shape, dtype=self.cmptype)
+        dset.read_direct(buffer)
+        return [buffer['real'], buffer['imag']]
+
+    # @brief function to read the solution steps 1..numSteps into one complex (steps, dofs) matrix
+    # @note every step is read directly into its row, viewed as the {real, imag} compound
+    def readSolutionSteps(self, numSteps):
+        return self.readSolutionColumns(numSteps, slice(None), slice(None))
+
+    # @brief function to read selected dofs of selected solution steps (zero-indexed) as complex (steps, dofs)
+    # @note sparse dof selections are read as point selections, dense ones as the contiguous span they cover
+    def readSolutionColumns(self, numSteps, dofIndices, steps):
+        numDofs = self.getNumDofs()
+        stepIndices = np.arange(numSteps)[steps]
+        if isinstance(dofIndices, slice) and dofIndices == slice(None):
+            solution = np.empty((len(stepIndices), numDofs), dtype=np.complex128)
+            for iRow, iStep in enumerate(stepIndices):
+                self.filehdf5['/Solution/State/vecFemStep' + str(iStep+1)].read_direct(solution[iRow].view(self.cmptype))
+            return solution
+        dofIndices = np.arange(numDofs)[dofIndices]
+        solution = np.empty((len(stepIndices), len(dofIndices)), dtype=np.complex128)
+        if len(dofIndices) == 0:
+            return solution
+        [uniqueDofs, inverse] = np.unique(dofIndices, return_inverse=True)
+        # dense dof sets are read as the contiguous span they cover, sparse ones as point selection
+        span = slice(int(uniqueDofs[0]), int(uniqueDofs[-1]) + 1)
+        readSpan = len(uniqueDofs) * 16 > span.stop - span.start
+        buffer = np.empty(span.stop - span.start if readSpan else len(uniqueDofs), dtype=np.complex128)
+        for iRow, iStep in enumerate(stepIndices):
+            dset = self.filehdf5['/Solution/State/vecFemStep' + str(iStep+1)]
+            if readSpan:
+                dset.read_direct(buffer.view(self.cmptype), source_sel=np.s_[span])
+                solution[iRow,:] = buffer[dofIndices - span.start]
+            else:
+                dset.read_direct(buffer.view(self.cmptype), source_sel=np.s_[uniqueDofs])
+                solution[iRow,:] = buffer[inverse]
+        return solution
@@ -25,27 +25,65 @@ import numpy as np
 
 # project modules
 from automate.mod_hdf5 import cFileHdf5
+from automate.math.mRomEvaluation import evaluateRomTransferFunctions
 
 class cElpasoFileRomHdf5:
     # @brief initialization method
     # @note unit-tested
     def __init__(self, filename):
         self.filename = filename
+        self.myfile = None          # read handle, opened on first access and kept until closeFile
+        self.datasetLists = {}      # cached dataset listings of the handle
+        self.attributeMaps = {}     # cached attribute maps of the handle
         # cGeneralLogging.addStatementToLog('>> elPaSo rom file initialized | file: ' + self.filename)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.closeFile()
+
+    # @brief function to get the managed read handle of the rom file
+    def getFile(self):
+        if self.myfile is None:
+            self.myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+            self.datasetLists = {}
+            self.attributeMaps = {}
+        return self.myfile
+
+    # @brief function to close the managed read handle and drop the cached listings
+    def closeFile(self):
+        if self.myfile is not None:
+            self.myfile.closeFile()
+            self.myfile = None
+        self.datasetLists = {}
+        self.attributeMaps = {}
+
+    # @brief function to get the (cached) list of datasets in a group
+    def getDataSetList(self, path):
+        if path not in self.datasetLists:
+            self.datasetLists[path] = self.getFile().getDataSetList(path)
+        return self.datasetLists[path]
+
+    # @brief function to get the (cached) map of all attributes of a group
+    def getAttributeMap(self, path):
+        if path not in self.attributeMaps:
+            self.attributeMaps[path] = dict(self.getFile().filehdf5[path].attrs.items())
+        return self.attributeMaps[path]
+
     # @brief function to get the latest error data
     # @note unit-tested
     def getLatestErrorData(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
-        dslist = myfile.getDataSetList('/SystemModRed/Error')
+        myfile = self.getFile()
+        dslist = self.getDataSetList('/SystemModRed/Error')
         ydata = myfile.readdataset_complexcompound('/SystemModRed/Error', dslist[len(dslist)-1])
         return ydata
 
     # @brief function to get the history expansion points
     def getExpansionPointsHistory(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         id = self.getAttribute('/SystemModRed/Training','training_id')
-        listofEP = myfile.getDataSetList('/SystemModRed/Training')
+        listofEP = self.getDataSetList('/SystemModRed/Training')
         id_array = []
         ep_array = []
         for every_ds in listofEP:
@@ -62,7 +100,7 @@ class cElpasoFileRomHdf5:
     # @brief function to get the expansion points
     # @note unit-tested
     def getExpansionPoints(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         id = self.getAttribute('/SystemModRed/Training','training_id')
         xdata = myfile.readdataset_complexcompound('/SystemModRed/Training', 'vecCurrentEPs_'+id)
         return xdata
@@ -70,16 +108,16 @@ class cElpasoFileRomHdf5:
     # @brief function to get the training point data
     # @note unit-tested
     def getTrainingPoints(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         id = self.getAttribute('/SystemModRed/Training','training_id')
         xdata = myfile.readdataset_complexcompound('/SystemModRed/Training', 'vecTrainingPoints_I'+id)
         return xdata
 
     # @brief function to get the history training points
     def getTrainingPointsHistory(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         id = self.getAttribute('/SystemModRed/Training','training_id')
-        listofEP = myfile.getDataSetList('/SystemModRed/Training')
+        listofEP = self.getDataSetList('/SystemModRed/Training')
         id_array = []
         ep_array = []
         for every_ds in listofEP:
@@ -95,21 +133,18 @@ class cElpasoFileRomHdf5:
 
     # @brief function to read the frequency interval
     def getDefinedFrequencyInterval(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
-        start = myfile.readAttribute('/SystemModRed','freq_min')
-        end = myfile.readAttribute('/SystemModRed','freq_max')
+        start = self.getAttribute('/SystemModRed','freq_min')
+        end = self.getAttribute('/SystemModRed','freq_max')
         return float(start), float(end)
 
     # @brief function to get all transfer functions
     # @note unit-tested
     def getAllTransferFunctions(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
-        dslist = myfile.getDataSetList('/SystemModRed/TransferFunction')
+        myfile = self.getFile()
+        dslist = self.getDataSetList('/SystemModRed/TransferFunction')
         freq = np.zeros(len(dslist))
 
-        testread = myfile.readdataset_complexcompound('/SystemModRed/TransferFunction', dslist[0])
-        numoutput = testread.shape[0]
-        numinput = testread.shape[1]
+        [numoutput, numinput] = myfile.getDataSetShape('/SystemModRed/TransferFunction', dslist[0])
 
         hdata = np.zeros((numoutput, numinput, len(dslist)), dtype=complex)
 
@@ -128,43 +163,58 @@ class cElpasoFileRomHdf5:
     # @brief function to get a specific transfer function
     # @note unit-tested
     def getTransferFunctions(self, i_inp, i_out):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
-        dslist = myfile.getDataSetList('/SystemModRed/TransferFunction')
-        hdata = np.zeros(len(dslist), dtype=complex)
+        return self.getTransferFunctionSelection((i_out, i_inp))
+
+    # @brief function to get a selection (entry, rows or columns given as h5py selection on [output, input]) of all transfer functions
+    # @note only the selected hyperslab of every frequency is read, the frequency is the last axis of the result
+    def getTransferFunctionSelection(self, selection):
+        myfile = self.getFile()
+        dslist = self.getDataSetList('/SystemModRed/TransferFunction')
 
         # read frequency available
         freq_data, sorting = self.getEvaluatedTransferFunctionFrequency()
 
+        # without any frequency step the selection is applied to the rom input/output dimensions only
+        if len(dslist) == 0:
+            if not (myfile.datasetExists('/SystemModRed/SignalC/mtxCmatRom') and myfile.datasetExists('/SystemModRed/SignalB/mtxBmatRom')):
+                return np.zeros(0, dtype=complex), freq_data
+            numoutput = myfile.getDataSetShape('/SystemModRed/SignalC', 'mtxCmatRom')[0]
+            numinput = myfile.getDataSetShape('/SystemModRed/SignalB', 'mtxBmatRom')[1]
+            return np.zeros(np.shape(np.empty((numoutput, numinput))[selection]) + (0,), dtype=complex), freq_data
+
+        hdata = None
         indx = 0
         for everyds in dslist:
-            hdata[indx] = myfile.readdataset_complexcompound('/SystemModRed/TransferFunction', everyds)[i_out][i_inp]
+            hselected = myfile.readdataset_complexcompound('/SystemModRed/TransferFunction', everyds, selection)
+            if hdata is None:
+                hdata = np.zeros(np.shape(hselected) + (len(dslist),), dtype=complex)
+            hdata[..., indx] = hselected
             indx+=1
 
-        hdata = hdata[sorting]
+        hdata = hdata[..., sorting]
 
         return hdata, freq_data
 
     # function to get eigen value information from file
     def getEigenValueInWindow(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         return myfile.readdataset_complexcompound( '/SystemModRed/Eigen', 'vecEigValInFreqWindow')
 
     # @brief function to get an attribute value
     # @note unit-tested
     def getAttribute(self, path, attribute):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
-        return myfile.readAttribute( path, attribute)
+        return self.getAttributeMap(path)[attribute]
 
     # @brief function to get evaluated frequency from attribute data
     # @note unit-tested
     def getEvaluatedTransferFunctionFrequency(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
-        listofatt = myfile.getAttributeList('/SystemModRed/TransferFunction')
+        attributes = self.getAttributeMap('/SystemModRed/TransferFunction')
+        listofatt = list(attributes.keys())
         freq = np.zeros(len(listofatt))
         iIndx = 0
         for everyatt in listofatt:
             id = int(everyatt.split('FreqStep')[1])-1
-            freq[iIndx] = float(myfile.readAttribute('/SystemModRed/TransferFunction', 'FreqStep' + str(id+1)))
+            freq[iIndx] = float(attributes['FreqStep' + str(id+1)])
             iIndx += 1
         id_sort = np.argsort(freq)
         freq = freq[id_sort]
@@ -173,48 +223,48 @@ class cElpasoFileRomHdf5:
     # @brief function to get the rom dimension
     # @note unit-tested
     def getRomDimension(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         rom_stiffness_mat = myfile.readdataset_complexcompound('/SystemModRed/Stiffness', 'mtxStiffnessRom')
         return rom_stiffness_mat.shape[0]
 
     # @brief function to get the projection basis V dimension
     # @note unit-tested
     def getBasisVDimension(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         basis = myfile.readdataset_complexcompound('/SystemModRed/Bases', 'mtxBasisV')
         return basis.shape
 
     # @brief function to get the projection basis W dimension
     # @note unit-tested
     def getBasisWDimension(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         basis = myfile.readdataset_complexcompound('/SystemModRed/Bases', 'mtxBasisW')
         return basis.shape
 
     # @brief function to get the number of inputs
     # @note unit-tested
     def getNumInputs(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         rom_input_mat = myfile.readdataset_complexcompound('/SystemModRed/SignalB', 'mtxBmatRom')
         return rom_input_mat.shape[1]
 
     # @brief function to get the number of outputs
     # @note unit-tested
     def getNumOutputs(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         rom_input_mat = myfile.readdataset_complexcompound('/SystemModRed/SignalC', 'mtxCmatRom')
         return rom_input_mat.shape[0]
 
     # @brief function to read a dataset
     # @note unit-tested
     def readDataSet(self, path, dsetname):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         return myfile.readdataset(path, dsetname)
 
     # @brief function to read ROM matrices
     # @note unit-tested
     def readRomSystemMatrices(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         system_rom = {}
         system_rom['KROM'] = myfile.readdataset_complexcompound('/SystemModRed/Stiffness','mtxStiffnessRom')
         system_rom['DROM'] = myfile.readdataset_complexcompound('/SystemModRed/Damping','mtxDampingRom')
@@ -224,31 +274,42 @@ class cElpasoFileRomHdf5:
         return system_rom
 
     # @brief function to write the ROM matrices
+    # @param storage optional chunks, compression, compression_opts and shuffle passed to every dataset (see cFileHdf5.getStorageOptions)
     # @note unit-tested
-    def writeRomSystemMatrices(self, KROM, DROM, MROM, BROM, CROM, VMAT, WMAT):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'a')
-        myfile.writedataset_complexcompound('/SystemModRed/Stiffness','mtxStiffnessRom', KROM)
-        myfile.writedataset_complexcompound('/SystemModRed/Damping','mtxDampingRom', DROM)
-        myfile.writedataset_complexcompound('/SystemModRed/Mass','mtxMassRom', MROM)
-        myfile.writedataset_complexcompound('/SystemModRed/SignalB','mtxBmatRom', BROM)
-        myfile.writedataset_complexcompound('/SystemModRed/SignalC','mtxCmatRom', CROM)
-        myfile.writedataset_complexcompound('/SystemModRed/Bases','mtxBasisV', VMAT)
-        myfile.writedataset_complexcompound('/SystemModRed/Bases','mtxBasisW', WMAT)
-        myfile.closeFile()
+    def writeRomSystemMatrices(self, KROM, DROM, MROM, BROM, CROM, VMAT, WMAT, **storage):
+        self.closeFile()    # the read handle has to be released before the file is opened for writing
+        with cFileHdf5.cFileHdf5(self.filename, 'a') as myfile:
+            myfile.writedataset_complexcompound('/SystemModRed/Stiffness','mtxStiffnessRom', KROM, **storage)
+            myfile.writedataset_complexcompound('/SystemModRed/Damping','mtxDampingRom', DROM, **storage)
+            myfile.writedataset_complexcompound('/SystemModRed/Mass','mtxMassRom', MROM, **storage)
+            myfile.writedataset_complexcompound('/SystemModRed/SignalB','mtxBmatRom', BROM, **storage)
+            myfile.writedataset_complexcompound('/SystemModRed/SignalC','mtxCmatRom', CROM, **storage)
+            myfile.writedataset_complexcompound('/SystemModRed/Bases','mtxBasisV', VMAT, **storage)
+            myfile.writedataset_complexcompound('/SystemModRed/Bases','mtxBasisW', WMAT, **storage)
 
     # @brief function to read ROM signal matrices
     # @note unit-tested
     def readRomSystemSignals(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         system_rom = {}
         system_rom['BROM'] = myfile.readdataset_complexcompound('/SystemModRed/SignalB','mtxBmatRom')
         system_rom['CROM'] = myfile.readdataset_complexcompound('/SystemModRed/SignalC','mtxCmatRom')
         return system_rom
 
+    # @brief function to evaluate the transfer functions of the stored ROM matrices
+    # @param freq frequencies in Hz, defaults to the frequencies of the stored transfer functions
+    # @note see mRomEvaluation.evaluateRomTransferFunctions for method, batchSize and numWorkers
+    def evaluateTransferFunctions(self, freq=None, method='direct', batchSize=64, numWorkers=1):
+        if freq is None:
+            freq, sorting = self.getEvaluatedTransferFunctionFrequency()
+        system_rom = self.readRomSystemMatrices()
+        system_rom.update(self.readRomSystemSignals())
+        return evaluateRomTransferFunctions(system_rom, freq, method, batchSize, numWorkers), freq
+
     # function to read tangent basis
     # @note unit-tested
     def readTangentBasis(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         system_rom = {}
         system_rom['TMAT'] = myfile.readdataset_complexcompound('/SystemModRed/Bases','mtxBasisT')
         return system_rom
@@ -256,7 +317,7 @@ class cElpasoFileRomHdf5:
     # function to read projection bases
     # @note unit-tested
     def readProjectionBases(self):
-        myfile = cFileHdf5.cFileHdf5(self.filename, 'r')
+        myfile = self.getFile()
         system_rom = {}
         system_rom['VMAT'] = myfile.readdataset_complexcompound('/SystemModRed/Bases','mtxBasisV')
         system_rom['WMAT'] = myfile.readdataset_complexcompound('/SystemModRed/Bases','mtxBasisW')
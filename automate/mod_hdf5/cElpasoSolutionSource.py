@@ -0,0 +1,48 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+### Details: cElpasoSolutionSource - lazy solution source over an elPaSo result file
+
+# project modules
+from automate.mod_hdf5.cElpasoFileResultHdf5 import cElpasoFileResultHdf5
+
+class cElpasoSolutionSource:
+    # @brief initialization method - the result file is opened on the first read
+    def __init__(self, filename, numSteps):
+        self.filename = filename
+        self.reader = None
+        with cElpasoFileResultHdf5(self.filename) as reader:
+            self.shape = (numSteps, reader.getNumDofs())
+
+    # @brief the open file handle is not pickled, it is reopened on the next read
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['reader'] = None
+        return state
+
+    # @brief function to close the result file
+    def closeFile(self):
+        if self.reader is not None:
+            self.reader.closeFile()
+            self.reader = None
+
+    # @brief function to read the complex solution of the given dofs and steps as (steps, dofs)
+    def readSolution(self, dofIndices, steps):
+        if self.reader is None:
+            self.reader = cElpasoFileResultHdf5(self.filename)
+        return self.reader.readSolutionColumns(self.shape[0], dofIndices, steps)
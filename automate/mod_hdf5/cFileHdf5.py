@@ -31,6 +31,13 @@ class cFileHdf5:
         self.filenamehdf5 = filename
         self.filehdf5 = h5py.File(self.filenamehdf5, mode)
         self.cmptype = np.dtype([('real','float64'), ('imag','float64')])
+        self.chunkBytes = 1024*1024     # target size of an automatically chosen chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.closeFile()
 
     # @brief Function to close the hdf5 file
     # @note unit-tested
@@ -89,18 +96,67 @@ class cFileHdf5:
 
         return set_list
 
+    # @brief Function to choose a chunk shape of about chunkBytes
+    # @note tall-skinny matrices (e.g. projection bases) are chunked in blocks of whole rows
+    def getAutoChunks(self, shape, itemsize):
+        if len(shape) == 0 or 0 in shape:
+            return None
+        if len(shape) == 2 and shape[0] >= shape[1]:
+            rows = max(1, min(shape[0], self.chunkBytes // max(1, shape[1]*itemsize)))
+            return (rows, shape[1])
+        return True
+
+    # @brief Function to assemble the storage options of a new dataset
+    # @param chunks None (contiguous unless compressed), 'auto', True (h5py guess) or a chunk shape
+    # @param compression None, 'gzip' or 'lzf'; compression_opts is the gzip level
+    # @param shuffle enables the byte shuffle filter in front of the compression
+    def getStorageOptions(self, shape, itemsize, chunks=None, compression=None, compression_opts=None, shuffle=False):
+        options = {}
+        if chunks is None and (compression is not None or shuffle):
+            chunks = 'auto'
+        if chunks == 'auto':
+            chunks = self.getAutoChunks(shape, itemsize)
+        if chunks is not None:
+            options['chunks'] = chunks
+        if compression is not None:
+            options['compression'] = compression
+            if compression_opts is not None:
+                options['compression_opts'] = compression_opts
+        if shuffle:
+            options['shuffle'] = True
+        return options
+
     # @brief Function to add a dataset
     # @note unit-tested
-    def addDataSet(self, path, datasetname, value):
-        self.filehdf5.create_dataset(path + '/' + datasetname, data=value)
+    def addDataSet(self, path, datasetname, value, chunks=None, compression=None, compression_opts=None, shuffle=False):
+        value = np.asarray(value)
+        options = self.getStorageOptions(value.shape, value.dtype.itemsize, chunks, compression, compression_opts, shuffle)
+        self.filehdf5.create_dataset(path + '/' + datasetname, data=value, **options)
 
     # @brief Function to read a complex compound datatype
+    # @param selection optional h5py selection (index, slice or tuple of them), only the selected hyperslab is read from disk
     # @note unit-tested
-    def readdataset_complexcompound(self, path, dsetname):
+    def readdataset_complexcompound(self, path, dsetname, selection=None):
         dset = self.filehdf5[path + '/' + dsetname]
-        realdata = np.array(dset.fields("real")[:])
-        imagdata = np.array(dset.fields("imag")[:])
-        return realdata+imagdata*1j
+        if dset.dtype == self.cmptype:
+            # {real, imag} float64 compound has the memory layout of complex128, read without temporaries
+            if selection is None:
+                data = np.empty(dset.shape, dtype=np.complex128)
+                if data.size:
+                    dset.read_direct(data.view(self.cmptype))
+                return data
+            data = np.asarray(dset[selection]).view(np.complex128)
+            return data[()] if data.ndim == 0 else data
+        if selection is None:
+            realdata = np.array(dset.fields("real")[:])
+            imagdata = np.array(dset.fields("imag")[:])
+            return realdata+imagdata*1j
+        data = dset[selection]
+        return data['real']+data['imag']*1j
+
+    # @brief Function to get the shape of a dataset without reading it
+    def getDataSetShape(self, path, dsetname):
+        return self.filehdf5[path + '/' + dsetname].shape
 
     # @brief Function to write an empty complex compound datatype
     # @note unit-tested
@@ -110,18 +166,19 @@ class cFileHdf5:
 
     # @brief Function to write a complex compound datatype
     # @note unit-tested
-    def writedataset_complexcompound(self, path, dsetname, value):
+    def writedataset_complexcompound(self, path, dsetname, value, chunks=None, compression=None, compression_opts=None, shuffle=False):
         if value.dtype != self.cmptype:
-            value_tmp = value
-            value = np.zeros(value_tmp.shape, dtype=self.cmptype)
-            value['real'] = np.real(value_tmp)
-            value['imag'] = np.imag(value_tmp)
+            # complex128 is written through a compound view of its buffer, other types are converted once
+            value = np.asarray(value, dtype=np.complex128, order='C').view(self.cmptype)
 
         if self.datasetExists(path + '/' + dsetname):
             del self.filehdf5[path + '/' + dsetname]
 
         dt_type = np.dtype([('real','float64'), ('imag','float64')])
-        self.filehdf5.create_dataset(path + '/' + dsetname, value.shape, dtype=dt_type, data = value)
+        options = self.getStorageOptions(value.shape, dt_type.itemsize, chunks, compression, compression_opts, shuffle)
+        dset = self.filehdf5.create_dataset(path + '/' + dsetname, value.shape, dtype=dt_type, **options)
+        if value.size:
+            dset.write_direct(np.ascontiguousarray(value))
 
     # @brief function to read a dataset
     # @note unit-tested
@@ -0,0 +1,84 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+### Details: mBenchmarkHdf5 - throughput and size of the cFileHdf5 storage settings
+
+# python imports
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# project modules
+from automate.mod_hdf5 import cFileHdf5
+
+# storage settings compared by the benchmark
+STORAGE_SETTINGS = [
+    ['contiguous',      {}],
+    ['chunked',         {'chunks': 'auto'}],
+    ['lzf',             {'compression': 'lzf'}],
+    ['lzf+shuffle',     {'compression': 'lzf', 'shuffle': True}],
+    ['gzip1+shuffle',   {'compression': 'gzip', 'compression_opts': 1, 'shuffle': True}],
+    ['gzip4+shuffle',   {'compression': 'gzip', 'compression_opts': 4, 'shuffle': True}],
+]
+
+# @brief function to generate a tall-skinny complex matrix resembling a projection basis
+def generateBasis(rows, cols):
+    x = np.linspace(0., 1., rows)[:, None]
+    k = np.arange(1, cols+1)[None, :]
+    return np.sin(np.pi*k*x) + 1j*np.cos(np.pi*k*x)*np.exp(-k*x)
+
+# @brief function to measure write/read throughput and file size of one storage setting
+def benchmarkSetting(filename, value, storage, repeat):
+    writeTimes = []
+    readTimes = []
+    for iRepeat in range(repeat):
+        start = time.perf_counter()
+        with cFileHdf5.cFileHdf5(filename, 'w') as myfile:
+            myfile.createGroup('/SystemModRed')
+            myfile.writedataset_complexcompound('/SystemModRed', 'mtxBasisV', value, **storage)
+        writeTimes.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with cFileHdf5.cFileHdf5(filename, 'r') as myfile:
+            readback = myfile.readdataset_complexcompound('/SystemModRed', 'mtxBasisV')
+        readTimes.append(time.perf_counter() - start)
+        if not np.array_equal(readback, value):
+            print('ERROR! Benchmark read back differs from the written data')
+    return min(writeTimes), min(readTimes), os.path.getsize(filename)
+
+# @brief function to compare all storage settings on a basis matrix
+def benchmarkHdf5Storage():
+    parser = argparse.ArgumentParser(description='Benchmark of chunked and compressed hdf5 storage for ROM bases')
+    parser.add_argument('-benchmarkHdf5Storage','--benchmarkHdf5Storage', help='Runs the hdf5 storage benchmark', action='store_true', required=True)
+    parser.add_argument('-n','--rows', help='Number of basis rows', type=int, default=200000)
+    parser.add_argument('-k','--cols', help='Number of basis columns', type=int, default=50)
+    parser.add_argument('-r','--repeat', help='Repetitions per setting (best is reported)', type=int, default=3)
+    parser.add_argument('-f','--folder', help='Folder for the temporary files (e.g. on the shared filesystem)', default=None)
+    args = parser.parse_args()
+
+    value = generateBasis(args.rows, args.cols)
+    megabytes = value.nbytes / 1024**2
+    print('Basis %d x %d complex (%.1f MB)' % (args.rows, args.cols, megabytes))
+    print('%-16s %12s %12s %12s %8s' % ('Setting', 'Write MB/s', 'Read MB/s', 'Size MB', 'Ratio'))
+    with tempfile.TemporaryDirectory(dir=args.folder) as folder:
+        filename = os.path.join(folder, 'benchmark.hdf5')
+        for [name, storage] in STORAGE_SETTINGS:
+            [writeTime, readTime, size] = benchmarkSetting(filename, value, storage, args.repeat)
+            print('%-16s %12.1f %12.1f %12.1f %8.2f' % (name, megabytes/writeTime, megabytes/readTime, size/1024**2, value.nbytes/size))
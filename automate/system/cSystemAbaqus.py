@@ -25,6 +25,9 @@
 # Basic import
 import os, sys
 import glob
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 import pandas as pd
 import numpy as np
 
@@ -32,6 +35,9 @@ import numpy as np
 from automate import config
 from automate.system.cSystemInterface import *
 from automate.datastructure.cFeDataStructure import *
+from automate.datastructure.cDofMapIndex import cDofMapIndex
+from automate.datastructure.cArraySolutionSource import cArraySolutionSource
+from automate.tools.cBinarySidecar import cBinarySidecar
 
 # System class for Abaqus functionalities
 # Author: Harikrishnan Sreekumar
@@ -42,6 +48,13 @@ class cSystemAbaqus(cSystemInterface):
     # Date: 09.10.2020
     def parseConfiguration(self):
         self.systemConfig = {}
+        self.dofmap = None
+
+    # Return the dof map of the benchmark, read once per system
+    def getDofMap(self):
+        if self.dofmap is None:
+            self.dofmap = np.loadtxt(self.modelPath + config.pathSeparator + 'Benchmarked'  + config.pathSeparator + 'abaqus_dofmap.dat', delimiter=',')
+        return self.dofmap
     
     # Call the system binary for computation
     # Author: Harikrishnan Sreekumar
@@ -53,7 +66,7 @@ class cSystemAbaqus(cSystemInterface):
     # Author: Harikrishnan Sreekumar, Saurabh Rathore
     # Date: 09.10.2020
     def importFeResultsDeprecated(self, numDofsPerNode):
-        self.FeDataStructure = cFeDataStructure()
+        self.FeDataStructure = cFeDataStructure(self.solutionPrecision)
         print('Analyzing abaqus generated files...')
 
         freqFiles = (glob.glob(self.modelPath + config.pathSeparator + 'Benchmarked'  + config.pathSeparator + '*.csv'))  # gets list of all abaqus CSV results files
@@ -69,8 +82,7 @@ class cSystemAbaqus(cSystemInterface):
         numDofs = targetData.shape[0]*numDofsPerNode
 
         self.FeDataStructure.freqSteps = freqSteps
-        self.FeDataStructure.solutionReal = np.zeros((len(freqSteps), numDofs))
-        self.FeDataStructure.solutionImag = np.zeros((len(freqSteps), numDofs))
+        self.FeDataStructure.allocateSolution(len(freqSteps), numDofs)
         self.FeDataStructure.nodes = np.zeros((targetData.shape[0], 3))
 
         nodesMaped=False
@@ -97,129 +109,142 @@ class cSystemAbaqus(cSystemInterface):
 
         print('Analyzing abaqus generated files... Finished.')
     
+    # Return the sorted frequency steps of the abaqus csv result files with the given prefix (first step is dropped)
+    def getFrequencyStepsFromFiles(self, prefix):
+        freqFilesTemp = [os.path.basename(each) for each in glob.glob(self.modelPath + config.pathSeparator + 'Benchmarked' + config.pathSeparator + prefix + '*.csv')]
+        freqFilesTemp = map(lambda each: each.strip(".csv"), freqFilesTemp)
+        freqFilesTemp = map(lambda each: each.strip(prefix), freqFilesTemp)
+        freqSteps = list(map(float, freqFilesTemp))
+        freqSteps.sort()
+        freqSteps.pop(0)
+        return freqSteps
+
+    # Parse the abaqus csv result files of all frequency steps concurrently into numpy blocks (label, x, y, z, re, im, ...)
+    # At most twice the number of workers are pending so that only a few parsed blocks are held in memory
+    def readCsvBlocks(self, prefix, freqSteps):
+        files = [self.modelPath + config.pathSeparator + 'Benchmarked' + config.pathSeparator + prefix + str(freq) + '.csv' for freq in freqSteps]
+        numWorkers = max(1, min(config.abaqusCsvReadWorkers, len(files)))
+        readBlock = lambda file: pd.read_csv(file, engine='c').to_numpy(dtype=np.float64)
+        with ThreadPoolExecutor(max_workers=numWorkers) as executor:
+            pending = deque()
+            for file in files:
+                if len(pending) >= 2*numWorkers:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(readBlock, file))
+            while pending:
+                yield pending.popleft().result()
+
+    # Reorder the rows of a csv block to the node order of the reference labels
+    def alignCsvBlock(self, block, referenceLabels):
+        labels = block[:,0].astype(np.int64)
+        if np.array_equal(labels, referenceLabels):
+            return block
+        order = np.argsort(labels, kind='stable')
+        position = np.minimum(np.searchsorted(labels, referenceLabels, sorter=order), len(labels)-1)
+        if len(labels) != len(referenceLabels) or not np.array_equal(labels[order[position]], referenceLabels):
+            print('Dof sizes do not match')
+            sys.exit(-1)
+        return block[order[position]]
+
+    # Return the reference files the dof map import is based on
+    def getReferenceFiles(self):
+        benchmarkPath = self.modelPath + config.pathSeparator + 'Benchmarked' + config.pathSeparator
+        return sorted(glob.glob(benchmarkPath + 'U_*.csv') + glob.glob(benchmarkPath + 'POR_*.csv')) + [benchmarkPath + 'abaqus_dofmap.dat']
+
     # Imports the FE results of the current system into the datastructure using dofmaps
+    # The parsed reference data is kept in a binary sidecar and memory-mapped on repeated runs
+    # The sidecar is keyed by the absolute path of the result files, independent of the working directory
     # Author: Harikrishnan Sreekumar
     # Date: 14.10.2020
     def importFeResultsUsingDofMaps(self):
+        resultPath = os.path.abspath(self.modelPath + config.pathSeparator + 'Benchmarked')
+        sidecarName = self.modelName + '_' + hashlib.sha256(resultPath.encode()).hexdigest()[:16]
+        sidecar = cBinarySidecar(os.path.join(os.path.abspath(config.baseDir), config.sidecarFolderName, sidecarName))
+        sourceFiles = self.getReferenceFiles()
+        if sidecar.isValid(sourceFiles):
+            print('Analyzing abaqus generated files from binary sidecar...')
+        else:
+            # parsed once in double precision, afterwards the sidecar is used like on repeated runs
+            self.parseFeResultsUsingDofMaps()
+            sidecar.store(sourceFiles, {
+                "dofmap": self.getDofMap(),
+                "freqSteps": np.array(self.FeDataStructure.freqSteps, dtype=np.float64),
+                "nodes": self.FeDataStructure.nodes,
+                "solution": self.FeDataStructure.solution
+            })
+
+        data = sidecar.load()
+        self.dofmap = data["dofmap"]
+        self.FeDataStructure = cFeDataStructure(self.solutionPrecision)
+        self.FeDataStructure.freqSteps = data["freqSteps"].tolist()
+        self.FeDataStructure.nodes = data["nodes"]
+        self.FeDataStructure.setSolutionSource(cArraySolutionSource(data["solution"]))
+
+    # Parses the abaqus csv result files into the datastructure using dofmaps
+    # Author: Harikrishnan Sreekumar
+    # Date: 14.10.2020
+    def parseFeResultsUsingDofMaps(self):
         self.FeDataStructure = cFeDataStructure()
         print('Analyzing abaqus generated files from dof maps...')
 
-        dofmap = np.loadtxt(self.modelPath + config.pathSeparator + 'Benchmarked'  + config.pathSeparator + 'abaqus_dofmap.dat', delimiter=',')
+        dofmap = self.getDofMap()
 
         freqFiles_U = (glob.glob(self.modelPath + config.pathSeparator + 'Benchmarked'  + config.pathSeparator + 'U_*.csv'))  # gets list of all abaqus CSV results files
         freqFiles_POR = (glob.glob(self.modelPath + config.pathSeparator + 'Benchmarked'  + config.pathSeparator + 'POR_*.csv'))
         # bools
-        BOOL_U_RESULTS = False
-        BOOL_POR_RESULTS = False
-        # node counters
-        all_nodes = {}
-        if len(freqFiles_U):
-            BOOL_U_RESULTS = True
-        if len(freqFiles_POR):
-            BOOL_POR_RESULTS = True
-
-        # read all results to data
-        ###### U DATA                
-        data_u_freq = []
+        BOOL_U_RESULTS = len(freqFiles_U) > 0
+        BOOL_POR_RESULTS = len(freqFiles_POR) > 0
+
+        freqSteps_U = self.getFrequencyStepsFromFiles('U_') if BOOL_U_RESULTS else []
+        freqSteps_POR = self.getFrequencyStepsFromFiles('POR_') if BOOL_POR_RESULTS else []
+        freqSteps = freqSteps_POR if BOOL_POR_RESULTS else freqSteps_U
+        self.FeDataStructure.freqSteps = freqSteps
+
+        # the solution is filled block by block: all structural dofs (U) followed by all fluid dofs (POR)
+        numDofs = dofmap.shape[0]
+        self.FeDataStructure.allocateSolution(len(freqSteps), numDofs)
+        nodeBlocks = []
+        numDofs_U = 0
+
+        ###### U DATA
         if BOOL_U_RESULTS:
-            os.chdir(self.modelPath + config.pathSeparator + 'Benchmarked')
-            freqFilesTemp = glob.glob('U_*.csv') 
-            os.chdir(config.baseDir)
-            freqFilesTemp = map(lambda each: each.strip(".csv"), freqFilesTemp)
-            freqFilesTemp = map(lambda each: each.strip("U_"), freqFilesTemp)
-            freqSteps = list(map(float, freqFilesTemp))
-            freqSteps.sort()
-            freqSteps.pop(0)
-            #print('> Reading U dofs...')
-            self.FeDataStructure.freqSteps = freqSteps
-            for iStep in range(0,len(freqSteps)):
-                targetData = pd.read_csv(self.modelPath + config.pathSeparator + 'Benchmarked/U_'+ str(freqSteps[iStep])+ '.csv')
-                mappeddata_u_freq = {}
-                for iLabel in range(targetData.shape[0]):
-                    array = []
-                    currNode = int(targetData['label'][iLabel])
-                    for col in targetData.columns[1:]:
-                        array.append(targetData[col][iLabel])
-
-                    mappeddata_u_freq[currNode] = array
-                    all_nodes[currNode] = 'U'
-                
-                data_u_freq.append(mappeddata_u_freq)
-        
-        ##### POR DATA 
-        data_por_freq = []
+            labels_U = None
+            for iStep, block in enumerate(self.readCsvBlocks('U_', freqSteps_U)):
+                if labels_U is None:
+                    labels_U = block[:,0].astype(np.int64)
+                    numDofs_U = block[:,4::2].size
+                    if numDofs_U > numDofs:
+                        print('Dof sizes do not match')
+                        sys.exit(-1)
+                    nodeBlocks.append((labels_U, block[:,1:4]))
+                block = self.alignCsvBlock(block, labels_U)
+                self.FeDataStructure.solutionReal[iStep,:numDofs_U] = block[:,4::2].ravel()
+                self.FeDataStructure.solutionImag[iStep,:numDofs_U] = block[:,5::2].ravel()
+
+        ##### POR DATA
         if BOOL_POR_RESULTS:
-            os.chdir(self.modelPath + config.pathSeparator + 'Benchmarked')
-            freqFilesTemp = glob.glob('POR_*.csv') 
-            os.chdir(config.baseDir)
-            freqFilesTemp = map(lambda each: each.strip(".csv"), freqFilesTemp)
-            freqFilesTemp = map(lambda each: each.strip("POR_"), freqFilesTemp)
-            freqSteps = list(map(float, freqFilesTemp))
-            freqSteps.sort()
-            freqSteps.pop(0)  
             print('> Reading POR dofs...')
-            self.FeDataStructure.freqSteps = freqSteps
-            numStructNodes = len(all_nodes)
-            for iStep in range(0,len(freqSteps)):
-                targetData = pd.read_csv(self.modelPath + config.pathSeparator + 'Benchmarked/POR_'+ str(freqSteps[iStep])+ '.csv')
-                mappeddata_por_freq = {}
-                for iLabel in range(targetData.shape[0]):
-                    array = []
-                    currNode = int(targetData['label'][iLabel])+numStructNodes
-                    for col in targetData.columns[1:]:
-                        array.append(targetData[col][iLabel])
-                    mappeddata_por_freq[currNode] = array
-                    all_nodes[currNode] = 'POR'
-
-                data_por_freq.append(mappeddata_por_freq)
-                
-        # put the different dofs together
-        numDofs = dofmap.shape[0]
-        self.FeDataStructure.solutionReal = np.zeros((len(freqSteps), numDofs))
-        self.FeDataStructure.solutionImag = np.zeros((len(freqSteps), numDofs))
-        self.FeDataStructure.nodes = np.zeros((len(all_nodes), 3))
+            numStructNodes = len(nodeBlocks[0][0]) if nodeBlocks else 0
+            labels_POR = None
+            for iStep, block in enumerate(self.readCsvBlocks('POR_', freqSteps_POR)):
+                if labels_POR is None:
+                    labels_POR = block[:,0].astype(np.int64)
+                    if numDofs_U + len(labels_POR) != numDofs:
+                        print('Dof sizes do not match')
+                        sys.exit(-1)
+                    nodeBlocks.append((labels_POR + numStructNodes, block[:,1:4]))
+                block = self.alignCsvBlock(block, labels_POR)
+                self.FeDataStructure.solutionReal[iStep,numDofs_U:] = block[:,4]
+                self.FeDataStructure.solutionImag[iStep,numDofs_U:] = block[:,5]
+        elif numDofs_U != numDofs:
+            print('Dof sizes do not match')
+            sys.exit(-1)
 
         ## get all nodes
-        #print('> Parsing nodal coords...')
-        for iNode in all_nodes:
-            found = False
-            try:
-                nodeinfo = data_u_freq[0][iNode]
-                found = True
-            except:
-                nodeinfo = data_por_freq[0][iNode]
-                found = True
-
-            if found:
-                self.FeDataStructure.nodes[iNode-1,0] = nodeinfo[0]
-                self.FeDataStructure.nodes[iNode-1,1] = nodeinfo[1]
-                self.FeDataStructure.nodes[iNode-1,2] = nodeinfo[2]
-            else:
-                print('Node reading issue')
-                sys.exit(-1)
-
-        # get all solution
-        #print('> Parsing nodal solutions...')        
-        for iStep in range(0,len(freqSteps)):
-            solReal = []
-            solImag = []
-            for iNode in all_nodes:
-                if all_nodes[iNode] == 'U':
-                    nodal_sol = data_u_freq[iStep][iNode]
-                    solReal.extend(nodal_sol[3::2])
-                    solImag.extend(nodal_sol[4::2])
-                elif all_nodes[iNode] == 'POR':
-                    nodal_sol = data_por_freq[iStep][iNode]
-                    solReal.append(nodal_sol[3])
-                    solImag.append(nodal_sol[4])
-            
-            if len(solReal) != dofmap.shape[0] or len(solImag) != dofmap.shape[0]:
-                print('Dof sizes do not match')
-                sys.exit(-1)
+        self.FeDataStructure.nodes = np.zeros((sum([len(labels) for labels, coords in nodeBlocks]), 3))
+        for labels, coords in nodeBlocks:
+            self.FeDataStructure.nodes[labels-1,:] = coords
 
-            self.FeDataStructure.solutionReal[iStep,:] = solReal
-            self.FeDataStructure.solutionImag[iStep,:] = solImag
-        
         print('Analyzing abaqus generated files from dof maps... Finished.')
 
     # Imports the FE results of the current system into the datastructure using dofmaps
@@ -239,25 +264,23 @@ class cSystemAbaqus(cSystemInterface):
     # Author: Harikrishnan Sreekumar
     # Date: 14.10.2020
     def getDofIndexListForNode(self, node):
-        dofmap = np.loadtxt(self.modelPath + config.pathSeparator + 'Benchmarked'  + config.pathSeparator + 'abaqus_dofmap.dat', delimiter=',')
-        
-        indexDict = {}
-        for iNode in range(dofmap.shape[0]):
-            nodeId = dofmap[iNode][0]
-            if nodeId in indexDict:
-                arr = indexDict[nodeId] 
-                arr.append(iNode)
-            else:
-                arr = [iNode]
-            indexDict[nodeId] = arr            
-
-        return indexDict[node]
+        return self.getDofMapIndex().getDofIndexListForNode(node)
+
+    # Return the dof map index of the benchmark, built once per system
+    def getDofMapIndex(self):
+        if self.dofMapIndex is None:
+            self.dofMapIndex = cDofMapIndex(self.getDofMap()[:,0])
+        return self.dofMapIndex
 
     # Import performance test results for system target    
     # Author: Harikrishnan Sreekumar
     # Date: 22.12.2020
     def importPerformanceResults(self, import_type, reference_system):
         pass
+
+    # Import memory test results for system target
+    def importMemoryResults(self, reference_system):
+        pass
         
     # Delete temporary files generated by the system
     # Author: Harikrishnan Sreekumar
@@ -24,10 +24,12 @@
 
 # Basic import
 import os
+import sys
 import subprocess
 import configparser
 import re
 import glob
+import platform
 import numpy as np
 import h5py
 
@@ -35,7 +37,12 @@ import h5py
 from automate import config
 from automate.system.cSystemInterface import *
 from automate.datastructure.cFeDataStructure import *
+from automate.datastructure.cDofMapIndex import cDofMapIndex
 from automate.mod_hdf5.cElpasoFileRomHdf5 import cElpasoFileRomHdf5
+from automate.mod_hdf5.cElpasoSolutionSource import cElpasoSolutionSource
+from automate.mod_hdf5.cElpasoFileResultHdf5 import cElpasoFileResultHdf5
+from automate.tools.mParallelSweep import getPhysicalCoreCount, parseSweepCounts
+from automate.tools.cElpasoLog import cElpasoLog
 
 # System class for elPaSo functionalities
 # Author: Harikrishnan Sreekumar
@@ -76,11 +83,10 @@ class cSystemElpaso(cSystemInterface):
         # Generate ldd and spot if intel
         for iDependency in self.systemConfig["dependency-ldd"]:
             if(iDependency != ''):
-                os.system('rm env.txt')
-                os.system('ldd ' + self.binaryPath + self.binary  + ' | grep ' + iDependency + ' >> env.txt')
-                with open("env.txt", "r") as envread:
-                    if len(str(envread.read())) == 0:
-                        checksPassed = False
+                # captured directly, concurrent suites would race on a shared env.txt
+                lddOutput = subprocess.getoutput('ldd ' + self.binaryPath + self.binary  + ' | grep ' + iDependency)
+                if len(lddOutput) == 0:
+                    checksPassed = False
 
         if checksPassed:
             print('Conducting prechecks... checks passed')
@@ -91,28 +97,42 @@ class cSystemElpaso(cSystemInterface):
     # Call the system binary for computation
     # Author: Harikrishnan Sreekumar
     # Date: 09.10.2020
-    def computeResults(self, computepath, execprestatement, execflags, environment):        
+    def computeResults(self, computepath, execprestatement, execflags, environment, boolUseCache=False):        
         print('Computing...')
-        os.system('cp -r ' + self.modelPath + config.pathSeparator + 'model ' + computepath)
-        os.chdir(computepath)
+        self.staging.stageDirectory(self.modelPath + config.pathSeparator + 'model', computepath)
         self.systemCommand = environment + execprestatement + self.binaryPath + self.binary + ' -c -inp ' + self.modelName + '.' + self.systemConfig["input_type"] + ' ' + execflags;
+
+        self.resourceUsage = None
+        cacheKey = None
+        if boolUseCache and self.resultCache is not None:
+            cacheKey = self.resultCache.computeKey(self.binaryPath + self.binary, self.modelPath + config.pathSeparator + 'model', execflags, environment + execprestatement)
+            if self.resultCache.restoreResults(cacheKey, computepath):
+                print('Computing... Restored from result cache ' + cacheKey[:12])
+                return
+
         print('CMD: ',self.systemCommand)
-        os.system(self.systemCommand)
-        os.chdir(config.baseDir)
-        print('Computing... Finished')
+        self.resourceUsage = self.processRunner.run(self.systemCommand, computepath)
+        self.resourceHistory.append(self.resourceUsage)
+        exitStatus = self.resourceUsage["exitStatus"]
+        if exitStatus != 0:
+            print('WARNING! ' + self.binary + ' exited with status ' + str(exitStatus))
+        if cacheKey is not None and exitStatus == 0:
+            self.resultCache.storeResults(cacheKey, computepath)
+        print('Computing... Finished (wall %.2f s, cpu %.2f s, peak rss %.1f MiB)' % (self.resourceUsage["wallTime"], self.resourceUsage["cpuTime"],
+                                                                                     np.fmax(self.resourceUsage["maxRss"], self.resourceUsage["peakTreeRss"])/1024**2))
     
     # Perform correctness test on system under test
     # Author: Harikrishnan Sreekumar
     # Date: 22.12.2020
     def performCorrectnessTest(self):
-        self.computeResults(self.modelPath + config.pathSeparator + 'calculation', '', self.systemConfig["flag"], '')
+        self.computeResults(self.modelPath + config.pathSeparator + 'calculation', '', self.systemConfig["flag"], '', True)
         self.importFeResults()
         self.readTestLog(self.modelPath + config.pathSeparator + 'calculation')
     
     # Perform performance test on system under test
     # Author: Harikrishnan Sreekumar
     # Date: 22.12.2020
-    def performPerformanceTest(self, parallel_type, solver_tag, harnessconfig):
+    def performPerformanceTest(self, parallel_type, solver_tag, harnessconfig, numWarmup = 0, numRepetitions = 1, sweep = None):
         mpirunexec = 'mpirun'
         environment = ''
         if harnessconfig.CIEnvironment != None:
@@ -121,62 +141,173 @@ class cSystemElpaso(cSystemInterface):
                 mpirunexec = mpirunexec + ' --allow-run-as-root '
             #environment = 'export OMPI_ALLOW_RUN_AS_ROOT=1 && export OMPI_ALLOW_RUN_AS_ROOT_CONFIRM=1 && '
         
-        self.mpi_processes = []
-        self.omp_processes = []
-        
         self.solvertime = []
+        self.solvertimeSamples = []
+        self.binaryLogSamples = []
+        self.resourceSamples = []
+        self.peakmemory = []
         
-        if parallel_type in 'mpi': # conduct mpi parallelization
-            max_threads = 16#os.cpu_count()/2
-            iThread = 1
-            while iThread <= max_threads:
-                self.mpi_processes.append(iThread)
-                self.omp_processes.append(1)
-                iThread = iThread*2
-            #if self.mpi_processes[-1] < max_threads:
-            #    self.mpi_processes.append(int(max_threads))
-            #    self.omp_processes.append(1)
-            self.thread_vector =   self.mpi_processes       
-        elif parallel_type in 'omp': # conduct omp parallelization
-            max_threads = 16#os.cpu_count()/2
-            iThread = 1
-            while iThread <= max_threads:
-                self.mpi_processes.append(0)
-                self.omp_processes.append(iThread)
-                iThread = iThread*2
-            #if self.omp_processes[-1] < max_threads:
-            #    self.mpi_processes.append(0)
-            #    self.omp_processes.append(int(max_threads))   
-            self.thread_vector =   self.omp_processes       
-        
+        self.defineParallelSweep(parallel_type, sweep)
         solverFlags = self.getSolverFlags(solver_tag)    
         os.mkdir(self.modelPath + config.pathSeparator + 'calculation')
         for (iMPI, iOMP) in zip(self.mpi_processes,self.omp_processes):
             case_path = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + 'm' + str(iMPI) + '_o' + str(iOMP)
             environment = 'export OMP_NUM_THREADS=' + str(iOMP)+' && '
-            if parallel_type in 'omp':
+            if iMPI == 0:   # pure omp point, no mpirun
                 case_execprestatement = ''
                 case_execflag = self.systemConfig["flag"] + ' ' + solverFlags["solverMsgLvl"] + ' ' + solverFlags["solverOmpThreads"] + ' ' + str(iOMP)
             else:
                 case_execprestatement = mpirunexec + ' -np ' + str(iMPI)+' '
                 case_execflag = self.systemConfig["flag"] + ' ' + solverFlags["solverMsgLvl"]
-            self.computeResults(case_path, case_execprestatement, case_execflag, environment)
-            self.readTestLog(case_path)
-            self.solvertime.append(self.parseSolverTimeFromBinaryInfo()) 
+                if iOMP > 1 and solverFlags["solverOmpThreads"] != '':     # hybrid point
+                    case_execflag = case_execflag + ' ' + solverFlags["solverOmpThreads"] + ' ' + str(iOMP)
+            # warm-up runs are discarded, the median of the repetitions represents the sweep point
+            samples = []
+            logs = []
+            resources = []
+            for iRun in range(numWarmup + numRepetitions):
+                self.computeResults(case_path, case_execprestatement, case_execflag, environment)
+                self.readTestLog(case_path)
+                if iRun >= numWarmup:
+                    samples.append(self.parseSolverTimeFromBinaryInfo())
+                    logs.append(self.binaryLog)
+                    resources.append(self.resourceUsage)
+            self.solvertimeSamples.append(samples)
+            self.binaryLogSamples.append(logs)
+            self.resourceSamples.append(resources)
+            self.solvertime.append(float(np.median(samples)))
+            self.peakmemory.append(max([self.getPeakMemoryPerRank(resource, iMPI) for resource in resources]))
+
+    # Perform memory test on system under test
+    # The sweep is run once, the measured profile is written to the output logs (<suite>_memory_profile.csv) to serve as future
+    # reference, it survives the removal of the calculation folder and is taken over as Benchmarked/memory_profile.csv
+    def performMemoryTest(self, parallel_type, solver_tag, harnessconfig, sweep = None):
+        self.performPerformanceTest(parallel_type, solver_tag, harnessconfig, 0, 1, sweep)
+        self.writeMemoryProfile(harnessconfig.outputDirectory + config.pathSeparator + config.outputFolderName + config.pathSeparator + 'logs' +
+                                config.pathSeparator + self.modelName + '_memory_profile.csv')
+
+    # Return the peak resident memory in MiB of the largest process (mpi rank) of a run
+    # Without rusage the summed peak of the process tree is shared among the ranks
+    def getPeakMemoryPerRank(self, resourceUsage, numRanks):
+        if np.isfinite(resourceUsage["maxRss"]):
+            return resourceUsage["maxRss"]/1024**2
+        return resourceUsage["peakTreeRss"]/max(numRanks, 1)/1024**2
+
+    # Write the memory profile of the sweep as csv file
+    def writeMemoryProfile(self, filename):
+        with open(filename, 'w') as file:
+            file.write('mpi,omp,peak_rss_mib\n')
+            for (iMPI, iOMP, memory) in zip(self.mpi_processes, self.omp_processes, self.peakmemory):
+                file.write(str(iMPI) + ',' + str(iOMP) + ',' + '%.3f' % memory + '\n')
+    
+    # Define the mpi and omp process counts of the performance sweep
+    # parallel_type 'mpi' sweeps pure mpi, 'omp' pure omp (mpi count 0, no mpirun) and 'hybrid' the grid of both
+    # sweep holds the specifications "mpi" and "omp" (see parseSweepCounts) and "max_cores" (a number or 'auto' for the
+    # physical cores of the host). Without a sweep the legacy powers of two up to 16 are used
+    def defineParallelSweep(self, parallel_type, sweep = None):
+        if sweep is None:
+            sweep = {"mpi": 'pow2', "omp": 'pow2', "max_cores": '16'}
+        if str(sweep["max_cores"]).strip() == 'auto':
+            max_cores = getPhysicalCoreCount()
+        else:
+            max_cores = int(sweep["max_cores"])
+
+        if parallel_type == 'hybrid':
+            mpi_counts = parseSweepCounts(sweep["mpi"], max_cores)
+            omp_counts = parseSweepCounts(sweep["omp"], max_cores)
+        elif parallel_type in 'mpi': # conduct mpi parallelization
+            mpi_counts = parseSweepCounts(sweep["mpi"], max_cores)
+            omp_counts = [1]
+        elif parallel_type in 'omp': # conduct omp parallelization
+            mpi_counts = [0]
+            omp_counts = parseSweepCounts(sweep["omp"], max_cores)
+        else:
+            print('ERROR! Unknown parallel type for the performance sweep: ' + parallel_type)
+            sys.exit(2)
+
+        self.mpi_processes = []
+        self.omp_processes = []
+        for iMPI in mpi_counts:
+            for iOMP in omp_counts:
+                if max(iMPI, 1)*iOMP <= max_cores:
+                    self.mpi_processes.append(iMPI)
+                    self.omp_processes.append(iOMP)
+        self.thread_vector = [max(iMPI, 1)*iOMP for (iMPI, iOMP) in zip(self.mpi_processes, self.omp_processes)]
+        if len(self.thread_vector) == 0:
+            print('ERROR! The performance sweep is empty for at most ' + str(max_cores) + ' cores')
+            sys.exit(2)
+
+    # Return the number of cores occupied by the largest point of the performance sweep
+    def getSweepCoreDemand(self, parallel_type, sweep = None):
+        self.defineParallelSweep(parallel_type, sweep)
+        return max(self.thread_vector)
     
     # Import performance test results for system target    
     # Author: Harikrishnan Sreekumar
     # Date: 22.12.2020
     def importPerformanceResults(self,import_type, reference_system):
         self.solvertime = []
+        self.solvertimeSamples = []
+        self.binaryLogSamples = []
         if import_type in 'log':
             for (iMPI, iOMP) in zip(reference_system.mpi_processes,reference_system.omp_processes):
                 case_path = self.modelPath + config.pathSeparator + 'Benchmarked' + config.pathSeparator + 'm' + str(iMPI) + '_o' + str(iOMP)
+                if not os.path.exists(case_path + config.pathSeparator + self.modelName + '.log.0'):
+                    print('WARNING! No benchmarked reference for sweep point m' + str(iMPI) + '_o' + str(iOMP))
+                    self.solvertime.append(float('nan'))
+                    self.solvertimeSamples.append([])
+                    self.binaryLogSamples.append([])
+                    continue
                 self.readTestLog(case_path)
                 self.solvertime.append(self.parseSolverTimeFromBinaryInfo())
+                # repeated reference runs (subfolders of the case holding a log) form the reference distribution
+                samples = [self.solvertime[-1]]
+                logs = [self.binaryLog]
+                for repetition_path in sorted(glob.glob(case_path + config.pathSeparator + '*' + config.pathSeparator + self.modelName + '.log.0')):
+                    self.readTestLog(os.path.dirname(repetition_path))
+                    samples.append(self.parseSolverTimeFromBinaryInfo())
+                    logs.append(self.binaryLog)
+                self.solvertimeSamples.append(samples)
+                self.binaryLogSamples.append(logs)
         elif import_type in 'list':
             # not implemented
             raise            
+
+    # Import the performance history of this host from the performance database as reference
+    # The latest runs of every sweep point form its reference samples, the structured logs are not kept in the history
+    def importPerformanceHistory(self, database, reference_system):
+        self.solvertime = []
+        self.solvertimeSamples = []
+        self.binaryLogSamples = []
+        for (iMPI, iOMP) in zip(reference_system.mpi_processes,reference_system.omp_processes):
+            history = database.getHistory(self.modelName, 'm' + str(iMPI) + '_o' + str(iOMP), platform.node(), config.performanceHistoryWindow)
+            self.solvertimeSamples.append(history)
+            self.binaryLogSamples.append([])
+            self.solvertime.append(float(np.median(history)) if len(history) else float('nan'))
+
+    # Import memory test results for system target from the stored profile Benchmarked/memory_profile.csv
+    def importMemoryResults(self, reference_system):
+        self.peakmemory = []
+        profile = {}
+        filename = self.modelPath + config.pathSeparator + 'Benchmarked' + config.pathSeparator + 'memory_profile.csv'
+        if os.path.exists(filename):
+            data = np.atleast_1d(np.genfromtxt(filename, delimiter=',', names=True))
+            profile = {(int(entry['mpi']), int(entry['omp'])): float(entry['peak_rss_mib']) for entry in data}
+        else:
+            print('WARNING! No benchmarked memory profile ' + filename)
+        for (iMPI, iOMP) in zip(reference_system.mpi_processes,reference_system.omp_processes):
+            if (iMPI, iOMP) not in profile and len(profile):
+                print('WARNING! No benchmarked memory reference for sweep point m' + str(iMPI) + '_o' + str(iOMP))
+            self.peakmemory.append(profile.get((iMPI, iOMP), float('nan')))
+    
+    # Return the median time of a log phase for every sweep point, NaN where the logs do not contain the phase
+    def getPhaseTimeVector(self, phase):
+        phasetime = []
+        for logs in self.binaryLogSamples:
+            samples = [log.getPhaseTime(phase) for log in logs]
+            samples = [sample for sample in samples if sample is not None]
+            phasetime.append(float(np.median(samples)) if len(samples) else float('nan'))
+        return np.array(phasetime)
     
     # Return the solver flags
     # Author: Harikrishnan Sreekumar
@@ -205,14 +336,21 @@ class cSystemElpaso(cSystemInterface):
         return solverFlag
     
     # Parse Solver Time Representation in Binary Info and return time in seconds
+    # The first "solve system" entry of the binary info (d:h:m:s) is used, the timing tree of the log serves as fallback
     # Author: Harikrishnan Sreekumar
     # Date: 22.12.2020
     def parseSolverTimeFromBinaryInfo(self):
         for entry in self.binaryInfo:
             if entry.find("solve system") != -1:
-                time=entry.split()[3].split(':')
-                return float(time[0])*86400 + float(time[1])*3600 + float(time[2])*60 + float(time[3])
-                   
+                time=entry.split()[3].split(':') if len(entry.split()) > 3 else []
+                if len(time) == 4:
+                    return float(time[0])*86400 + float(time[1])*3600 + float(time[2])*60 + float(time[3])
+                break
+        # other log layouts - the solver time is taken from the timing tree of the log
+        if self.binaryLog is not None:
+            seconds = self.binaryLog.getPhaseTime('solve system')
+            if seconds is not None:
+                return seconds
         raise    
         
     # Delete temporary files generated by the system
@@ -227,80 +365,39 @@ class cSystemElpaso(cSystemInterface):
     def importFeResults(self, dummy=0):
         print('Analyzing elPaSo generated files...')
 
-        self.FeDataStructure = cFeDataStructure()
+        self.FeDataStructure = cFeDataStructure(self.solutionPrecision)
 
-        if self.systemConfig["analysis"] == 'frequency':
-            freqSteps = self.readFrequencyFromAK3(self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + self.modelName + '.' + self.systemConfig["input_type"])
-            self.freqSteps = freqSteps
-            self.FeDataStructure.freqSteps = freqSteps
-        
+        if self.systemConfig["analysis"] in ['frequency', 'eigen', 'static']:
             filename_hdf5 = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + self.modelName + '.' + self.systemConfig["input_type"]
             resultFilename_hdf5 = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + 'eGenOutput_' + self.modelName + '.' + self.systemConfig["input_type"]
-            self.FeDataStructure.nodes = self.readNodesFromHdf5(filename_hdf5)            # Getting Nodal data from Source (eLPaSo)
-        
-            filehdf5 = h5py.File(resultFilename_hdf5, 'r') # read mode
-            dset = filehdf5['/Solution/Maps/mtxDofMap']
-            self.FeDataStructure.solutionReal = np.zeros((len(freqSteps), dset.shape[0]))
-            self.FeDataStructure.solutionImag = np.zeros((len(freqSteps), dset.shape[0]))
-        
-            for iStep in range(0,len(freqSteps)):
-                [solutionReal, solutionImag] = self.readResultsFromHdf5(resultFilename_hdf5, iStep+1) 
-                self.FeDataStructure.solutionReal[iStep,:] = solutionReal
-                self.FeDataStructure.solutionImag[iStep,:] = solutionImag
-        elif self.systemConfig["analysis"] == 'eigen':
-            resultFilename_hdf5 = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + 'eGenOutput_' + self.modelName + '.' + self.systemConfig["input_type"]
-            filename_hdf5 = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + self.modelName + '.' + self.systemConfig["input_type"]
 
-            eigvalues = self.readEigenValueInfoFromHdf5(resultFilename_hdf5)
-            self.freqSteps = eigvalues
-            self.FeDataStructure.freqSteps = eigvalues
-            self.FeDataStructure.nodes = self.readNodesFromHdf5(filename_hdf5)            # Getting Nodal data from Source (eLPaSo)
-        
-            filehdf5 = h5py.File(resultFilename_hdf5, 'r') # read mode
-            dset = filehdf5['/Solution/Maps/mtxDofMap']
-            self.FeDataStructure.solutionReal = np.zeros((len(eigvalues), dset.shape[0]))
-            self.FeDataStructure.solutionImag = np.zeros((len(eigvalues), dset.shape[0]))
-
-            for iStep in range(0,len(eigvalues)):
-                [solutionReal, solutionImag] = self.readResultsFromHdf5(resultFilename_hdf5, iStep+1) 
-                self.FeDataStructure.solutionReal[iStep,:] = solutionReal
-                self.FeDataStructure.solutionImag[iStep,:] = solutionImag
-        elif self.systemConfig["analysis"] == 'static':
-            resultFilename_hdf5 = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + 'eGenOutput_' + self.modelName + '.' + self.systemConfig["input_type"]
-            filename_hdf5 = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + self.modelName + '.' + self.systemConfig["input_type"]
+            with cElpasoFileResultHdf5(resultFilename_hdf5) as result_reader:  # single open for the step information
+                if self.systemConfig["analysis"] == 'frequency':
+                    stepValues = self.readFrequencyFromAK3(filename_hdf5)
+                elif self.systemConfig["analysis"] == 'eigen':
+                    stepValues = result_reader.readEigenValues()
+                else:
+                    stepValues = result_reader.readStaticStepValues()
+                self.freqSteps = stepValues
+                self.FeDataStructure.freqSteps = stepValues
+                self.FeDataStructure.nodes = self.readNodesFromHdf5(filename_hdf5)            # Getting Nodal data from Source (eLPaSo)
 
-            staticStepValues = self.readStaticStepInfoFromHdf5(resultFilename_hdf5)
-            self.freqSteps = staticStepValues
-            self.FeDataStructure.freqSteps = staticStepValues
-            self.FeDataStructure.nodes = self.readNodesFromHdf5(filename_hdf5)            # Getting Nodal data from Source (eLPaSo)
-        
-            filehdf5 = h5py.File(resultFilename_hdf5, 'r') # read mode
-            dset = filehdf5['/Solution/Maps/mtxDofMap']
-            self.FeDataStructure.solutionReal = np.zeros((len(staticStepValues), dset.shape[0]))
-            self.FeDataStructure.solutionImag = np.zeros((len(staticStepValues), dset.shape[0]))
-
-            for iStep in range(0,len(staticStepValues)):
-                [solutionReal, solutionImag] = self.readResultsFromHdf5(resultFilename_hdf5, iStep+1) 
-                self.FeDataStructure.solutionReal[iStep,:] = solutionReal
-                self.FeDataStructure.solutionImag[iStep,:] = solutionImag
+            # the solution is read lazily, only for the dofs used by the comparison
+            self.FeDataStructure.setSolutionSource(cElpasoSolutionSource(resultFilename_hdf5, len(stepValues)))
         elif self.systemConfig["analysis"] == 'mor-offline':
             # check if the ROM results matched with ROM results?
             resultFilename_hdf5 = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + 'eGenModRed_ROM.hdf5'
             filename_hdf5 = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + self.modelName + '.' + self.systemConfig["input_type"]
             
-            rom_reader = cElpasoFileRomHdf5(resultFilename_hdf5)
-            all_H, freqSteps = rom_reader.getAllTransferFunctions()
+            with cElpasoFileRomHdf5(resultFilename_hdf5) as rom_reader:
+                all_H, freqSteps = rom_reader.getAllTransferFunctions()
             self.freqSteps = freqSteps
             self.FeDataStructure.freqSteps = freqSteps
             self.FeDataStructure.nodes = self.readNodesFromHdf5(filename_hdf5)            # Getting Nodal data from Source (eLPaSo)
         
+            # row iStep holds the flattened transfer matrix of the step
             nshape = all_H.shape[0]*all_H.shape[1]
-            self.FeDataStructure.solutionReal = np.zeros((len(freqSteps), nshape))
-            self.FeDataStructure.solutionImag = np.zeros((len(freqSteps), nshape))
-                        
-            for iStep in range(len(freqSteps)):
-                self.FeDataStructure.solutionReal[iStep,:] = np.real(all_H[:,:,iStep].flatten())
-                self.FeDataStructure.solutionImag[iStep,:] = np.imag(all_H[:,:,iStep].flatten())
+            self.FeDataStructure.setSolution(all_H.reshape(nshape, len(freqSteps)).T)
             # check if VMAT size is the same?
         else:
             print('Unknown analysis. Exiting...')
@@ -316,22 +413,15 @@ class cSystemElpaso(cSystemInterface):
             # in this case we expect the dof id in one-indexed to be inputed as node
             return np.array([node-1]) # to zero indexed
         else:
-            resultFilename_hdf5 = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + 'eGenOutput_' + self.modelName + '.' + self.systemConfig["input_type"]
-
-            filehdf5 = h5py.File(resultFilename_hdf5, 'r') # read mode
-            dofmap = filehdf5['/Solution/Maps/mtxDofMap']        
-        
-            indexDict = {}
-            for iNode in range(dofmap.shape[0]):
-                nodeId = dofmap[iNode][0]
-                if nodeId in indexDict:
-                    arr = indexDict[nodeId] 
-                    arr.append(iNode)
-                else:
-                    arr = [iNode]
-                indexDict[nodeId] = arr            
+            return self.getDofMapIndex().getDofIndexListForNode(node)
 
-            return indexDict[node]
+    # Return the dof map index of the results, built once per system
+    def getDofMapIndex(self):
+        if self.dofMapIndex is None:
+            resultFilename_hdf5 = self.modelPath + config.pathSeparator + 'calculation' + config.pathSeparator + 'eGenOutput_' + self.modelName + '.' + self.systemConfig["input_type"]
+            with cElpasoFileResultHdf5(resultFilename_hdf5) as result_reader:
+                self.dofMapIndex = cDofMapIndex(result_reader.readDofMapNodeIds())
+        return self.dofMapIndex
 
     # Imports the FE results of the current system into the datastructure from HDF5 file formats
     # Author: Harikrishnan Sreekumar
@@ -363,15 +453,14 @@ class cSystemElpaso(cSystemInterface):
     # Author: Saurabh Rathore
     # Date: 09.10.2020
     def readElpasoDetails(self, logFile):
-        SourceInfo = []
-        with open(logFile) as file:
-            lines = file.readlines()
-            # freq
-            SourceInfo = [" ".join(lines[1].split()), " ".join(lines[3].split()), " ".join(lines[4].split()), " ".join(lines[5].split()), " ".join(lines[6].split()), " ".join(lines[8].split()),
-            " ".join(lines[9].split()), " ".join(lines[10].split()), " ".join(lines[11].split()), " ".join(lines[12].split()), " ".join(lines[13].split())]
-            for l in range (0,20):
-                SourceInfo.append(" ".join(lines[int(len(lines))-21+l].split()))
-        file.close()
+        self.binaryLog = cElpasoLog(logFile)
+        lines = self.binaryLog.headLines
+        # freq
+        SourceInfo = [" ".join(lines[1].split()), " ".join(lines[3].split()), " ".join(lines[4].split()), " ".join(lines[5].split()), " ".join(lines[6].split()), " ".join(lines[8].split()),
+        " ".join(lines[9].split()), " ".join(lines[10].split()), " ".join(lines[11].split()), " ".join(lines[12].split()), " ".join(lines[13].split())]
+        lines = self.binaryLog.getLastLines()
+        for l in range (0,20):
+            SourceInfo.append(" ".join(lines[int(len(lines))-21+l].split()))
         return SourceInfo
 
     # need to change
@@ -413,12 +502,12 @@ class cSystemElpaso(cSystemInterface):
     # Author: Harikrishnan Sreekumar
     # Date: 13.12.2021
     def readNodesFromHdf5(self, modelhdf5):
-        filehdf5 = h5py.File(modelhdf5, 'r') # read mode
-        dset = filehdf5['/Nodes/mtxFemNodes']
-        xCoords = np.array(dset.fields("xCoords")[:])
-        yCoords = np.array(dset.fields("yCoords")[:])
-        zCoords = np.array(dset.fields("zCoords")[:])
-        ids = np.array(dset.fields("Ids")[:])
+        with h5py.File(modelhdf5, 'r') as filehdf5: # read mode
+            nodedata = filehdf5['/Nodes/mtxFemNodes'][:]
+        xCoords = nodedata["xCoords"]
+        yCoords = nodedata["yCoords"]
+        zCoords = nodedata["zCoords"]
+        ids = nodedata["Ids"]
 
         ids_indx_sorted = np.argsort(ids)
 
@@ -453,43 +542,22 @@ class cSystemElpaso(cSystemInterface):
     # Author: Harikrishnan Sreekumar
     # Date: 13.12.2021
     def readResultsFromHdf5(self, resultshdf5, step):
-        filehdf5 = h5py.File(resultshdf5, 'r') # read mode
-        dset = filehdf5['/Solution/State/vecFemStep' + str(step)]
-        realdata = np.array(dset.fields("real")[:])
-        imagdata = np.array(dset.fields("imag")[:])
-        return [realdata, imagdata]
+        with cElpasoFileResultHdf5(resultshdf5) as result_reader:
+            return result_reader.readSolutionStep(step)
 
     # Reads eigenvalues from hdf5
     # Author: Harikrishnan Sreekumar
     # Date: 04.05.2022
     def readEigenValueInfoFromHdf5(self, resultshdf5):
-        filehdf5 = h5py.File(resultshdf5, 'r') # read mode
-        att_list = filehdf5['/Solution/State']
-
-        eigvals = []
-        for att in att_list:
-            if 'EigStep' in att:
-                eigval = float(filehdf5['/Solution/State'].attrs[att])
-                eigvals.append(eigval)
-
-        eigvals = np.array(eigvals)
-        return eigvals
+        with cElpasoFileResultHdf5(resultshdf5) as result_reader:
+            return result_reader.readEigenValues()
     
     # Reads static steps from hdf5
     # Author: Harikrishnan Sreekumar
     # Date: 05.05.2022
     def readStaticStepInfoFromHdf5(self, resultshdf5):
-        filehdf5 = h5py.File(resultshdf5, 'r') # read mode
-        att_list = filehdf5['/Solution/State']
-
-        staticvals = []
-        for att in att_list:
-            if 'StaticStep' in att:
-                val = float(filehdf5['/Solution/State'].attrs[att])
-                staticvals.append(val)
-
-        staticvals = np.array(staticvals)
-        return staticvals
+        with cElpasoFileResultHdf5(resultshdf5) as result_reader:
+            return result_reader.readStaticStepValues()
     
     # deprecated. Replaced with hdf5
     #def readResultsFromSTP(self, pathSTP):
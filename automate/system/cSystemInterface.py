@@ -25,6 +25,10 @@
 # Basic imports
 import abc
 
+# Project imports
+from automate.tools.cStaging import cStaging
+from automate.tools.cProcessRunner import cProcessRunner
+
 # System interface class
 # Author: Harikrishnan Sreekumar
 # Date: 09.10.2020
@@ -44,9 +48,24 @@ class cSystemInterface(metaclass=abc.ABCMeta):
         self.binary = systemName            # same as systemtype
 
         self.FeDataStructure = None         # datastructure handle
+        self.solutionPrecision = 'double'   # precision of the FE solution - 'double' or 'single' (complex64)
+        self.dofMapIndex = None             # node to dof index - built on first lookup
+
+        self.resultCache = None             # result cache handle - set only if caching is enabled
+        self.staging = cStaging()           # stages the model into calculation folders
+        self.processRunner = cProcessRunner()   # runs the system binary and records its resource usage
+
+        # Resource usage of the system binary
+        self.resourceUsage = None           # resource usage of the latest run - None if restored from cache
+        self.resourceHistory = []           # resource usage of all runs
+        self.resourceSamples = []           # resource usage of every performance sweep point (per repetition)
+        self.peakmemory = []                # peak resident memory per mpi rank in MiB of every sweep point
 
         # Binary related
         self.binaryInfo = []                # binary info - includes version and performance related data
+        self.binaryLog = None               # structured log of the binary - timing tree and metadata
+        self.solvertimeSamples = []         # solver time samples of every performance sweep point
+        self.binaryLogSamples = []          # structured logs of every performance sweep point (per repetition)
         
     @classmethod
     def __subclasshook__(cls, subclass):
@@ -114,3 +133,8 @@ class cSystemInterface(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def importPerformanceResults(self, import_type, reference_system):
         pass
+
+    # Abstract method: Import memory test results for system target
+    @abc.abstractmethod
+    def importMemoryResults(self, reference_system):
+        pass
@@ -48,6 +48,9 @@ class cHarnessConfiguration(object):
         self.boolRunPerformanceTests = True
         self.boolReportIssueGitlab = False      # [False]: By default no issues are communicated
         self.mpiPath = None                     # MPI path
+        self.numParallelJobs = 1                # [1]: Number of test suites executed concurrently in worker processes
+        self.resultCacheDirectory = None        # [None]: Folder of the persistent result cache, no caching if not set
+        self.performanceDatabase = None         # [None]: SQLite file collecting the performance history, no history if not set
 
     # Read Configuration from file    
     # Author: Dominiik Reifer
@@ -66,6 +69,7 @@ class cHarnessConfiguration(object):
     # Date: 06.10.2020
     def assertConfiguration(self):
         assert self.outputDirectory
+        assert self.numParallelJobs >= 1
         if self.boolRunPerformanceTests:
             assert self.mpiPath
 
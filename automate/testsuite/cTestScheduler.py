@@ -0,0 +1,70 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# Test scheduler: Class to execute test suites concurrently within the core budget of the host
+# Performance and memory suites receive an exclusive, non-overlapping cpu set, correctness suites are packed into the free cores
+class cTestScheduler(object):
+    # Constructor
+    def __init__(self, numJobs):
+        self.numJobs = numJobs                  # Maximum number of suites executed at the same time
+        self.hostCores = self.getHostCores()    # Cpu ids available to the harness
+
+    # Return the cpu ids the harness is allowed to run on
+    def getHostCores(self):
+        try:
+            return sorted(os.sched_getaffinity(0))
+        except AttributeError:
+            return list(range(os.cpu_count()))
+
+    # Execute all suites and write the finished suites back in their original order
+    # executeFunction(suite, cpuset) is called in a worker process and returns the finished suite
+    # onFinished(index) is called in the harness process for every finished suite
+    def executeTestSuites(self, suites, executeFunction, onFinished):
+        demands = [min(suite.getCoreDemand(), len(self.hostCores)) for suite in suites]
+        # largest demands first: performance and memory suites start on an empty machine and correctness suites fill the gaps
+        queue = sorted(range(len(suites)), key=lambda iSuite: -demands[iSuite])
+        freeCores = list(self.hostCores)
+        running = {}
+
+        print('> Scheduling ' + str(len(suites)) + ' testsuites on ' + str(len(self.hostCores)) + ' cores with ' + str(self.numJobs) + ' jobs...')
+        with ProcessPoolExecutor(max_workers=self.numJobs) as executor:
+            while queue or running:
+                # launch in queue order, a waiting suite blocks the ones behind to avoid starving large demands
+                while queue and len(running) < self.numJobs and demands[queue[0]] <= len(freeCores):
+                    iSuite = queue.pop(0)
+                    cpuset = freeCores[:demands[iSuite]]
+                    freeCores = freeCores[demands[iSuite]:]
+                    running[executor.submit(executeFunction, suites[iSuite], cpuset)] = (iSuite, cpuset)
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    iSuite, cpuset = running.pop(future)
+                    suites[iSuite] = future.result()
+                    freeCores = sorted(freeCores + cpuset)
+                    onFinished(iSuite)
+        return suites
@@ -25,7 +25,6 @@ import matplotlib.pyplot as plt
 # Basic imports
 import sys
 import configparser
-import math
 import numpy as np
 
 # Project imports
@@ -34,6 +33,9 @@ from automate.system.cSystemInterface import cSystemInterface
 from automate.system.cSystemElpaso import cSystemElpaso
 from automate.system.cSystemAbaqus import cSystemAbaqus
 from automate.math.mMathLibrary import *
+from automate.tools.cResultCache import cResultCache
+from automate.tools.cPerformanceDatabase import cPerformanceDatabase
+from automate.datastructure.cNodeMatcher import cNodeMatcher
 
 # Class that defines a test suite
 # Author: Harikrishnan Sreekumar
@@ -50,6 +52,11 @@ class cTestSuite(object):
         self.systemTarget = None                # System targeted
         self.errorNorm = None                   # Error norm
         self.nodeMap = None                     # Node map between the SUT and SyT
+        self.nodeMatcher = None                 # Spatial index over the SyT nodes
+        self.fullFieldErrors = None             # Error summary of a full-field comparison
+        self.errorMetrics = None                # Additional error metrics (max abs, rms, relative) from the batched norm kernels
+        self.performanceStatistics = None       # Per sweep point statistics of a repeated performance test
+        self.phaseStatistics = None             # Per phase and sweep point comparison of the log timings
         
         self.suiteConfig = {
             "author": "<empty>",
@@ -62,13 +69,14 @@ class cTestSuite(object):
 
         self.suiteConfig["name"] = name         # Suite name
         
-        self.testType = None                    # Type of test type. Supported: correctness, performance
+        self.testType = None                    # Type of test type. Supported: correctness, performance, memory
         self.testResult = None                  # Variable to contain PASSED/FAILED/SKIPPED
         self.testRemark = ''                    # String to add test remarks
         self.testData = None                    # Container for detailed information of the test which is printed
         
         self.wordingCorrectness = "correctness"
         self.wordingPerformance = "performance"
+        self.wordingMemory = "memory"
         
         self.wordingPassed = "PASSED"
         self.wordingFailed = "FAILED"
@@ -81,6 +89,8 @@ class cTestSuite(object):
     # Date: 09.10.2020
     def defineSystemUnderTestFromConfig(self, path):
         self.systemUnderTest = self.defineSystem(self.suiteConfig["stest"], path, True)
+        if self.harnessconfig.resultCacheDirectory is not None:
+            self.systemUnderTest.resultCache = cResultCache(self.harnessconfig.resultCacheDirectory)
         
     # Define the system targetted
     # Author: Harikrishnan Sreekumar
@@ -93,12 +103,14 @@ class cTestSuite(object):
     # Date: 09.10.2020
     def defineSystem(self, systemName, path, boolSUT):
         if 'elpaso' in systemName or 'elpasoC' in systemName:
-            return cSystemElpaso(systemName, path, self.suiteConfig["name"], self.suiteConfig["dir"], boolSUT)
+            system = cSystemElpaso(systemName, path, self.suiteConfig["name"], self.suiteConfig["dir"], boolSUT)
         elif 'abaqus' in systemName:
-            return cSystemAbaqus(systemName, path, self.suiteConfig["name"], self.suiteConfig["dir"], boolSUT)
+            system = cSystemAbaqus(systemName, path, self.suiteConfig["name"], self.suiteConfig["dir"], boolSUT)
         else:
             print('Unknown system type')
             sys.exit(2)
+        system.solutionPrecision = self.suiteConfig["solution_precision"]
+        return system
             
     # Parse the configuration applicable for the suite
     # Author: Harikrishnan Sreekumar
@@ -119,14 +131,62 @@ class cTestSuite(object):
         self.suiteConfig["starget"] = myConfig.get('SystemTarget', 'system')
         
         self.suiteConfig["tolerance"] = float(myConfig.get('verification', 'error_tolerance'))
+        try:
+            self.suiteConfig["norm_precision"] = myConfig.get('verification', 'norm_precision')
+        except:
+            self.suiteConfig["norm_precision"] = 'double'
+        try:
+            self.suiteConfig["solution_precision"] = myConfig.get('verification', 'solution_precision')
+        except:
+            self.suiteConfig["solution_precision"] = 'double'
                 
         self.testType = myConfig.get('verification', 'test_type')
-        if self.testType in self.wordingPerformance:
+        if self.testType in self.wordingPerformance or self.testType in self.wordingMemory:
             self.suiteConfig["test_parallel"] =  myConfig.get('verification', 'test_parallel')
             self.suiteConfig["test_solver_tag"] =  myConfig.get('verification', 'test_solver_tag')
-            self.suiteConfig["ref_performance"] = myConfig.get('SystemTarget', 'ref_performance')
+            if self.testType in self.wordingPerformance:
+                self.suiteConfig["ref_performance"] = myConfig.get('SystemTarget', 'ref_performance')
+            try:
+                self.suiteConfig["perf_warmup"] = int(myConfig.get('verification', 'perf_warmup'))
+            except:
+                self.suiteConfig["perf_warmup"] = 0
+            try:
+                self.suiteConfig["perf_repetitions"] = int(myConfig.get('verification', 'perf_repetitions'))
+            except:
+                self.suiteConfig["perf_repetitions"] = 1
+            try:
+                self.suiteConfig["perf_alpha"] = float(myConfig.get('verification', 'perf_alpha'))
+            except:
+                self.suiteConfig["perf_alpha"] = 0.05
+            # log phases verified in addition to the solver time, e.g. "assemble system:0.2, solve system"
+            try:
+                checkPhases = myConfig.get('verification', 'check_phases')
+            except:
+                checkPhases = ''
+            self.suiteConfig["check_phases"] = self.parseCheckPhases(checkPhases)
+            # sweep specification, defaults reproduce the legacy powers of two up to 16
+            self.suiteConfig["sweep"] = {"mpi": 'pow2', "omp": 'pow2', "max_cores": '16'}
+            for key in self.suiteConfig["sweep"]:
+                try:
+                    self.suiteConfig["sweep"][key] = myConfig.get('verification', 'sweep_' + key)
+                except:
+                    pass
         elif self.testType in self.wordingCorrectness:
-            self.suiteConfig["compare_node_elpaso"] = float(myConfig.get('verification', 'compare_node_elpaso'))
+            try:
+                self.suiteConfig["compare_mode"] = myConfig.get('verification', 'compare_mode')
+            except:
+                self.suiteConfig["compare_mode"] = 'single'
+            if self.suiteConfig["compare_mode"] == 'full':
+                try:
+                    self.suiteConfig["compare_node_elpaso"] = float(myConfig.get('verification', 'compare_node_elpaso'))
+                except:
+                    self.suiteConfig["compare_node_elpaso"] = None      # not needed when the full field is compared
+            else:
+                self.suiteConfig["compare_node_elpaso"] = float(myConfig.get('verification', 'compare_node_elpaso'))
+            try:
+                self.suiteConfig["node_search_radius"] = float(myConfig.get('verification', 'node_search_radius'))
+            except:
+                self.suiteConfig["node_search_radius"] = 0.01
             try:
                 self.suiteConfig["starget_read_mode"] = myConfig.get('SystemTarget', 'read_mode')
             except:
@@ -135,8 +195,33 @@ class cTestSuite(object):
         self.suiteConfig["dof"] = 'deprecated and will be removed in future' # int(myConfig.get('calculation', 'dof'))
         self.suiteConfig["loadNode"] = 'deprecated and will be removed in future' # float(myConfig.get('verification', 'loadNode'))
 
+    # Parse the phases to check as list of [phase, tolerance]
+    # Phases are separated by commas, a phase without ":<tolerance>" uses the error tolerance of the suite
+    def parseCheckPhases(self, specification):
+        checkPhases = []
+        for entry in specification.split(','):
+            if entry.strip() == '':
+                continue
+            [phase, separator, tolerance] = entry.rpartition(':')
+            if separator == '':
+                checkPhases.append([" ".join(entry.split()), self.suiteConfig["tolerance"]])
+                continue
+            try:
+                checkPhases.append([" ".join(phase.split()), float(tolerance)])
+            except ValueError:
+                print('ERROR! Invalid tolerance in check_phases: ' + entry.strip())
+                sys.exit(2)
+        return checkPhases
+
     def getExecutionStatusandTestType(self):
         return [self.suiteConfig["executeTestcase"],self.testType ]
+
+    # Return the number of cores the suite occupies while executed
+    # Correctness suites are treated as single-threaded, performance and memory suites demand their largest sweep point
+    def getCoreDemand(self):
+        if self.testType in self.wordingPerformance or self.testType in self.wordingMemory:
+            return self.systemUnderTest.getSweepCoreDemand(self.suiteConfig["test_parallel"], self.suiteConfig["sweep"])
+        return 1
         
     # Perform routines associated to SUT
     # Author: Harikrishnan Sreekumar
@@ -150,7 +235,11 @@ class cTestSuite(object):
             if self.testType in self.wordingCorrectness:
                 self.systemUnderTest.performCorrectnessTest()
             elif self.testType in self.wordingPerformance:
-                self.systemUnderTest.performPerformanceTest(self.suiteConfig["test_parallel"], self.suiteConfig["test_solver_tag"], self.harnessconfig )
+                self.systemUnderTest.performPerformanceTest(self.suiteConfig["test_parallel"], self.suiteConfig["test_solver_tag"], self.harnessconfig,
+                                                            self.suiteConfig["perf_warmup"], self.suiteConfig["perf_repetitions"], self.suiteConfig["sweep"])
+            elif self.testType in self.wordingMemory:
+                self.systemUnderTest.performMemoryTest(self.suiteConfig["test_parallel"], self.suiteConfig["test_solver_tag"], self.harnessconfig,
+                                                       self.suiteConfig["sweep"])
     
     # Perform routines associated to SyT
     # Author: Harikrishnan Sreekumar
@@ -159,17 +248,29 @@ class cTestSuite(object):
         self.systemTarget.parseConfiguration()
         if self.testType in self.wordingCorrectness:
             self.systemTarget.importFeResults(self.suiteConfig["starget_read_mode"])
+        elif self.testType in self.wordingPerformance and self.suiteConfig["ref_performance"] == 'history':
+            if self.harnessconfig.performanceDatabase is None:
+                print('ERROR! ref_performance = history requires a performance database (-y)')
+                sys.exit(2)
+            database = cPerformanceDatabase(self.harnessconfig.performanceDatabase)
+            self.systemTarget.importPerformanceHistory(database, self.systemUnderTest)
+            database.close()
+            return  # no benchmarked log is needed
         elif self.testType in self.wordingPerformance:
             self.systemTarget.importPerformanceResults(self.suiteConfig["ref_performance"], self.systemUnderTest)
+        elif self.testType in self.wordingMemory:
+            self.systemTarget.importMemoryResults(self.systemUnderTest)
         self.systemTarget.readBenchmarkLog()
 
     # Filter common solution space between the SUT and SyT
     # Author: Saurabh rathore
     # Date: 09.10.2020
     def filterTest(self):
-        if self.testType in self.wordingCorrectness:            
+        if self.testType in self.wordingCorrectness and self.suiteConfig["compare_mode"] == 'full':
+            self.filterFullField()
+        elif self.testType in self.wordingCorrectness:            
             # create nodemap
-            NodeSearch_Radius = 0.01
+            NodeSearch_Radius = self.suiteConfig["node_search_radius"]
             self.nodeMap={}
     
             dataSuT = self.systemUnderTest.FeDataStructure
@@ -177,9 +278,14 @@ class cTestSuite(object):
             
             compare_node_elpaso=int(self.suiteConfig["compare_node_elpaso"])
             compare_node_elpaso_id = compare_node_elpaso-1
-            for j in range(0, int(len(dataSyT.nodes))):
-                if math.sqrt((dataSuT.nodes[compare_node_elpaso_id][0] - dataSyT.nodes[j][0]) ** 2 + (dataSuT.nodes[compare_node_elpaso_id][1] - dataSyT.nodes[j][1]) ** 2 + (dataSuT.nodes[compare_node_elpaso_id][2] - dataSyT.nodes[j][2]) ** 2) <= NodeSearch_Radius:
-                    self.nodeMap[compare_node_elpaso]=j+1
+            self.nodeMatcher = cNodeMatcher(dataSyT.nodes, NodeSearch_Radius)
+            [match, numCandidates] = self.nodeMatcher.matchNode(dataSuT.nodes[compare_node_elpaso_id])
+            if numCandidates == 0:
+                print('ERROR! NO TARGET NODE WITHIN RADIUS ' + str(NodeSearch_Radius) + ' OF NODE ' + str(compare_node_elpaso))
+                sys.exit(1)
+            elif numCandidates > 1:
+                print('WARNING! ' + str(numCandidates) + ' TARGET NODES WITHIN RADIUS ' + str(NodeSearch_Radius) + ' OF NODE ' + str(compare_node_elpaso) + ', USING THE NEAREST')
+            self.nodeMap[compare_node_elpaso]=match+1
 
             # match SUT and SyT
             dofIndexTarget = self.systemTarget.getDofIndexListForNode(self.nodeMap[compare_node_elpaso])
@@ -193,18 +299,100 @@ class cTestSuite(object):
                     print('ERROR! MISMATCH IN COMPARE FIELD')
                     sys.exit(1)
 
-            self.sourceVector=np.zeros((dataSuT.solutionReal.shape[0], len(dofIndexSource)), dtype=complex)
-            self.targetVector=np.zeros((dataSuT.solutionReal.shape[0], len(dofIndexTarget)), dtype=complex)
-
-            for id,dof in enumerate(dofIndexTarget):
-                self.targetVector[:,id] = dataSyT.solutionReal[:,dof] + 1j * dataSyT.solutionImag[:,dof]
-
-            for id,dof in enumerate(dofIndexSource):
-                self.sourceVector[:,id] = dataSuT.solutionReal[:,dof] + 1j * dataSuT.solutionImag[:,dof]
+            # only the compared dof columns are read from the solutions
+            self.targetVector = dataSyT.getSolution(dofIndexTarget)
+            self.sourceVector = dataSuT.getSolution(dofIndexSource)
             
         elif self.testType in self.wordingPerformance:
             self.sourceVector = np.array(self.systemUnderTest.solvertime)
             self.targetVector = np.array(self.systemTarget.solvertime)
+        elif self.testType in self.wordingMemory:
+            self.sourceVector = np.array(self.systemUnderTest.peakmemory)
+            self.targetVector = np.array(self.systemTarget.peakmemory)
+
+    # Compare the whole solution field of all nodes matched between the SUT and SyT
+    # The comparison runs in blocks of frequency steps and dofs to bound the peak memory
+    def filterFullField(self):
+        dataSuT = self.systemUnderTest.FeDataStructure
+        dataSyT = self.systemTarget.FeDataStructure
+        if self.systemUnderTest.systemConfig["analysis"] == 'mor-offline':
+            print('ERROR! FULL-FIELD COMPARISON IS NOT SUPPORTED FOR MOR-OFFLINE ANALYSIS')
+            sys.exit(2)
+
+        # node map for the whole mesh
+        self.nodeMatcher = cNodeMatcher(dataSyT.nodes, self.suiteConfig["node_search_radius"])
+        [matches, numCandidates] = self.nodeMatcher.matchNodes(dataSuT.nodes)
+        matchedNodes = np.nonzero(matches >= 0)[0]
+        numMissing = int(np.sum(numCandidates == 0))
+        numAmbiguous = int(np.sum(numCandidates > 1))
+        if numMissing:
+            print('WARNING! ' + str(numMissing) + ' SUT NODES WITHOUT TARGET NODE WITHIN RADIUS ' + str(self.suiteConfig["node_search_radius"]))
+        if numAmbiguous:
+            print('WARNING! ' + str(numAmbiguous) + ' SUT NODES WITH SEVERAL TARGET NODES WITHIN RADIUS, USING THE NEAREST')
+        if len(matchedNodes) == 0:
+            print('ERROR! NO MATCHING NODES BETWEEN SUT AND SYT')
+            sys.exit(1)
+        self.nodeMap = dict(zip((matchedNodes+1).tolist(), (matches[matchedNodes]+1).tolist()))
+
+        # dof pairs of all matched nodes
+        [sourceIndices, sourceOffsets] = self.systemUnderTest.getDofMapIndex().getDofIndexListForNodes(matchedNodes+1)
+        [targetIndices, targetOffsets] = self.systemTarget.getDofMapIndex().getDofIndexListForNodes(matches[matchedNodes]+1)
+        sourceCounts = np.diff(sourceOffsets)
+        targetCounts = np.diff(targetOffsets)
+        sameCount = sourceCounts == targetCounts
+        plateShell = (sourceCounts == 3) & (targetCounts == 6)     # known case of plate and shell mismatch
+        sourceLocal = np.arange(len(sourceIndices)) - np.repeat(sourceOffsets[:-1], sourceCounts)
+        sourceMask = np.repeat(sameCount, sourceCounts)
+        targetMask = np.repeat(sameCount, targetCounts)
+        pairSource = np.concatenate([sourceIndices[sourceMask], sourceIndices[sourceOffsets[:-1][plateShell]]])
+        pairTarget = np.concatenate([targetIndices[targetMask], targetIndices[targetOffsets[:-1][plateShell] + 2]])
+        pairNode = np.concatenate([np.repeat(np.arange(len(matchedNodes)), sourceCounts)[sourceMask], np.nonzero(plateShell)[0]])
+        pairLabel = np.concatenate([np.char.add(np.char.add('DOF ', (sourceLocal[sourceMask]+1).astype(str)), np.char.add('/', np.repeat(sourceCounts, sourceCounts)[sourceMask].astype(str))),
+                                    np.full(int(plateShell.sum()), 'DOF 1/3', dtype='<U16')])
+        [typeLabels, pairType] = np.unique(pairLabel, return_inverse=True)
+        numSkipped = int(np.sum(~sameCount & ~plateShell))
+        if numSkipped:
+            print('WARNING! ' + str(numSkipped) + ' MATCHED NODES SKIPPED DUE TO MISMATCH IN COMPARE FIELD')
+        if len(pairSource) == 0:
+            print('ERROR! MISMATCH IN COMPARE FIELD')
+            sys.exit(1)
+
+        # blockwise error accumulation
+        numSteps = dataSuT.getNumSteps()
+        errorSquareOverFreq = np.zeros(numSteps)
+        typeSquare = np.zeros(len(typeLabels))
+        typeMax = np.zeros(len(typeLabels))
+        nodeSquare = np.zeros(len(matchedNodes))
+        pairOrder = np.argsort(pairSource, kind='stable')  # chunks of ascending sut dofs are read as narrow [steps, dofs] blocks
+        for iStep in range(0, numSteps, config.fullFieldChunkSteps):
+            steps = slice(iStep, min(iStep + config.fullFieldChunkSteps, numSteps))
+            for iDof in range(0, len(pairSource), config.fullFieldChunkDofs):
+                dofs = pairOrder[iDof:iDof + config.fullFieldChunkDofs]
+                # only the block of the chunk is read, at most fullFieldChunkSteps x fullFieldChunkDofs per system
+                difference = dataSuT.getSolution(pairSource[dofs], steps) - dataSyT.getSolution(pairTarget[dofs], steps)
+                difference = difference.real**2 + difference.imag**2
+                errorSquareOverFreq[steps] += difference.sum(axis=1)
+                columnSquare = difference.sum(axis=0)
+                typeSquare += np.bincount(pairType[dofs], weights=columnSquare, minlength=len(typeLabels))
+                np.maximum.at(typeMax, pairType[dofs], np.sqrt(difference.max(axis=0)))
+                nodeSquare += np.bincount(pairNode[dofs], weights=columnSquare, minlength=len(matchedNodes))
+
+        self.errorNormOverFreq = np.sqrt(errorSquareOverFreq)
+        self.fullFieldErrors = {
+            "l2": float(np.sqrt(errorSquareOverFreq.sum())),
+            "max": float(typeMax.max()),
+            "types": [[str(typeLabels[iType]), float(np.sqrt(typeSquare[iType])), float(typeMax[iType]), int(np.sum(pairType == iType))] for iType in range(len(typeLabels))],
+            "missing": numMissing,
+            "ambiguous": numAmbiguous,
+            "skipped": numSkipped
+        }
+
+        # the node with the largest error is used for the frf plot
+        worstNode = np.argmax(nodeSquare)
+        worstPairs = np.nonzero(pairNode == worstNode)[0]
+        self.sourceVector = dataSuT.getSolution(pairSource[worstPairs])
+        self.targetVector = dataSyT.getSolution(pairTarget[worstPairs])
+        self.testRemark = self.testRemark + ' | Full-field comparison of ' + str(len(matchedNodes)) + ' nodes, plot shows node ' + str(matchedNodes[worstNode]+1) + ' with the largest error | '
 
     # Verify if the test passed
     # Author: Harikrishnan Sreekumar
@@ -216,6 +404,8 @@ class cTestSuite(object):
                 self.performCorrectnessCheck()
             elif self.testType in self.wordingPerformance:
                 self.performPerformanceCheck()
+            elif self.testType in self.wordingMemory:
+                self.performMemoryCheck()
             else:
                 print('    [Error] Unknown verification/test type: ' + self.testType)
                 sys.exit(2)
@@ -229,16 +419,29 @@ class cTestSuite(object):
             self.testData = [['Test Type','L2 Error Norm', 'Configured Tolerance', 'Test Result'],
                           [self.testType, '', self.suiteConfig["tolerance"], self.testResult]]
             
+    # Release the FE solution fields of both systems once verification is done
+    def releaseSolutionData(self):
+        for system in [self.systemUnderTest, self.systemTarget]:
+            if system is not None and system.FeDataStructure is not None:
+                system.FeDataStructure.closeSolutionSource()
+                system.FeDataStructure = None
+
     # Function to perform Correctness check
     # Author: Harikrishnan Sreekumar
     # Date: 17.12.2020
     def performCorrectnessCheck(self):        
-        # compute error norm
-        self.errorNormOverFreq = []        
-        for i in range(0, self.sourceVector.shape[0]): # for every frequency
-             self.errorNormOverFreq.append(computeVectorNorm(self.sourceVector[i,:] - self.targetVector[i,:]))
+        # compute error norm for all frequencies at once
+        precision = self.suiteConfig["norm_precision"]
+        difference = self.sourceVector - self.targetVector
+        if self.fullFieldErrors is None:
+            self.errorNormOverFreq = computeRowNorm(difference, precision)
         
         self.errorNorm = computeVectorNorm(self.errorNormOverFreq)
+        self.errorMetrics = {
+            "maxAbs": float(np.max(computeRowMaxAbs(difference, precision), initial=0)),
+            "rms": float(computeRowRms(difference.reshape(1, -1), precision)[0]),
+            "relativeL2": float(computeRelativeRowNorm(difference.reshape(1, -1), self.targetVector.reshape(1, -1), precision)[0])
+        }
 
         # criteria for pass/fail
         if self.errorNorm >= self.suiteConfig["tolerance"]:
@@ -249,6 +452,13 @@ class cTestSuite(object):
         # generate test data
         self.testData = [['Test Type','L2 Error Norm', 'Configured Tolerance', 'Test Result'],
                       [self.testType, self.errorNorm, self.suiteConfig["tolerance"], self.testResult]]
+        self.testData.append(['Error Metric', 'Max Abs Error', 'RMS Error', 'Relative L2 Error'])
+        self.testData.append(['Plotted DOFs', self.errorMetrics["maxAbs"], self.errorMetrics["rms"], self.errorMetrics["relativeL2"]])
+        if self.fullFieldErrors is not None:
+            self.testData.append(['Full Field','L2 Error Norm', 'Max Error', 'Compared DOFs'])
+            self.testData.append(['All DOFs', self.fullFieldErrors["l2"], self.fullFieldErrors["max"], sum([entry[3] for entry in self.fullFieldErrors["types"]])])
+            for entry in self.fullFieldErrors["types"]:
+                self.testData.append(entry)
         self.FindLoadNodeData()
                       
     # Trial Function to plot only load case data
@@ -266,14 +476,211 @@ class cTestSuite(object):
     # Author: Harikrishnan Sreekumar
     # Date: 22.12.2020
     def performPerformanceCheck(self):
-        self.errorNorm = computeVectorNorm(self.sourceVector - self.targetVector)/computeVectorNorm(self.sourceVector)
-        # criteria for pass/fail
-        if self.errorNorm  >= self.suiteConfig["tolerance"]:
+        precision = self.suiteConfig["norm_precision"]
+        # sweep points without a benchmarked reference are left out of the comparison
+        referenced = np.isfinite(self.targetVector)
+        if not np.all(referenced):
+            self.testRemark = self.testRemark + ' | ' + str(int(np.sum(~referenced))) + ' sweep point(s) without benchmarked reference | '
+        difference = np.reshape(self.sourceVector[referenced] - self.targetVector[referenced], (1, -1))
+        self.errorNorm = float(computeRelativeRowNorm(difference, np.reshape(self.sourceVector[referenced], (1, -1)), precision)[0])
+        self.errorMetrics = {
+            "maxAbs": float(computeRowMaxAbs(difference, precision)[0]),
+            "rms": float(computeRowRms(difference, precision)[0]),
+            "relativeL2": self.errorNorm
+        }
+        # criteria for pass/fail - statistical if repeated samples are available, else the relative L2 norm of the sweep
+        samples = self.systemUnderTest.solvertimeSamples
+        referenceSamples = self.systemTarget.solvertimeSamples
+        if self.suiteConfig["ref_performance"] == 'history':
+            self.performHistoryPerformanceCheck(samples, referenceSamples)
+        elif len(samples) == len(self.sourceVector) and len(referenceSamples) == len(samples) and \
+           max([len(sample) for sample in samples + referenceSamples]) > 1:
+            self.performStatisticalPerformanceCheck(samples, referenceSamples)
+        elif not np.any(referenced) or self.errorNorm  >= self.suiteConfig["tolerance"]:
             self.testResult = self.wordingFailed
         else:
             self.testResult = self.wordingPassed
+        if len(self.suiteConfig["check_phases"]):
+            self.performPhaseCheck()
             
         # generate test data
         self.testData = [['Test Type','L2 Error Norm', 'Configured Tolerance', 'Test Result'],
                       [self.testType, self.errorNorm , self.suiteConfig["tolerance"], self.testResult]]
+        if self.performanceStatistics is not None:
+            self.testData.append(['Sweep Point', 'Median (IQR) [s]', 'Reference Median [s]', 'Point Result'])
+            for entry in self.performanceStatistics:
+                self.testData.append([entry["point"], '%.3f (%.3f)' % (entry["median"], entry["iqr"]), '%.3f' % entry["referenceMedian"],
+                                      entry["result"] + ' (' + entry["decision"] + ')'])
+        if self.phaseStatistics is not None:
+            self.appendPhaseCheckData()
+        self.reportBestDecomposition(referenced)
+
+    # Decide every sweep point on the performance history of the host
+    # A point fails if its median is an outlier above the rolling baseline (robust z-score) or if the latest runs shifted
+    # against the runs before them (two-window change-point test at perf_alpha), in both cases by at least the tolerance.
+    # Points with too short a history or a (near) zero baseline are skipped
+    def performHistoryPerformanceCheck(self, samples, history):
+        self.performanceStatistics = []
+        boolFailed = False
+        for (iPoint, (sample, baseline)) in enumerate(zip(samples, history)):
+            [median, iqr, minimum] = computeSampleStatistics(sample)
+            point = 'm' + str(self.systemUnderTest.mpi_processes[iPoint]) + '_o' + str(self.systemUnderTest.omp_processes[iPoint])
+            if len(baseline) < config.performanceHistoryMinRuns:
+                self.performanceStatistics.append({
+                    "point": point, "median": median, "iqr": iqr, "min": minimum, "referenceMedian": float('nan'),
+                    "decision": 'history of ' + str(len(baseline)) + ' runs', "result": self.wordingSkipped
+                })
+                continue
+            [referenceMedian, referenceMad] = computeRobustBaseline(baseline)
+            if referenceMedian < config.performanceReferenceMinTime:
+                self.performanceStatistics.append({
+                    "point": point, "median": median, "iqr": iqr, "min": minimum, "referenceMedian": referenceMedian,
+                    "decision": 'reference below %g s' % config.performanceReferenceMinTime, "result": self.wordingSkipped
+                })
+                continue
+            zScore = computeRobustZScore(median, baseline)
+            boolPointFailed = zScore >= config.performanceHistoryZScore and (median - referenceMedian)/referenceMedian >= self.suiteConfig["tolerance"]
+            decision = 'z=%.1f' % zScore
+            [pValue, shift] = detectChangePoint(list(baseline) + [median], config.performanceChangePointWindow)
+            if pValue < self.suiteConfig["perf_alpha"] and shift >= self.suiteConfig["tolerance"]:
+                boolPointFailed = True
+                decision = decision + ', change p=%.3g' % pValue
+            boolFailed = boolFailed or boolPointFailed
+            self.performanceStatistics.append({
+                "point": point, "median": median, "iqr": iqr, "min": minimum, "referenceMedian": referenceMedian,
+                "decision": decision, "result": self.wordingFailed if boolPointFailed else self.wordingPassed
+            })
+        self.testResult = self.wordingFailed if boolFailed else self.wordingPassed
+
+    # Verify the configured log phases of every sweep point against the benchmarked logs
+    # A point fails if the median phase time grows by the phase tolerance or more. A phase found in the reference but
+    # not in the logs of the SUT fails, a phase without reference is skipped
+    def performPhaseCheck(self):
+        self.phaseStatistics = []
+        for (phase, tolerance) in self.suiteConfig["check_phases"]:
+            source = self.systemUnderTest.getPhaseTimeVector(phase)
+            target = self.systemTarget.getPhaseTimeVector(phase)
+            compared = np.isfinite(source) & np.isfinite(target) & (target > 0)
+            missing = ~np.isfinite(source) & np.isfinite(target)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                slowdown = (source - target)/target
+            pointFailed = missing | (compared & (slowdown >= tolerance))
+            if np.any(pointFailed):
+                result = self.wordingFailed
+                self.testResult = self.wordingFailed
+            elif np.any(compared):
+                result = self.wordingPassed
+            else:
+                result = self.wordingSkipped
+                self.testRemark = self.testRemark + ' | Phase ' + phase + ' without benchmarked reference | '
+            self.phaseStatistics.append({
+                "phase": phase, "tolerance": tolerance, "source": source, "target": target,
+                "slowdown": slowdown, "compared": compared, "failed": pointFailed, "result": result
+            })
+
+    # Append the summary per phase and the pass/fail matrix of every sweep point and phase to the test data
+    def appendPhaseCheckData(self):
+        points = ['m' + str(iMPI) + '_o' + str(iOMP) for (iMPI, iOMP) in zip(self.systemUnderTest.mpi_processes, self.systemUnderTest.omp_processes)]
+        self.testData.append(['Phase', 'Configured Tolerance', 'Max Slowdown', 'Phase Result'])
+        for entry in self.phaseStatistics:
+            maxSlowdown = '%+.1f%%' % (100*np.max(entry["slowdown"][entry["compared"]])) if np.any(entry["compared"]) else '-'
+            self.testData.append([entry["phase"], entry["tolerance"], maxSlowdown, entry["result"]])
+        self.testData.append(['Sweep Point | Phase', 'Time [s]', 'Reference [s]', 'Point Result'])
+        for (iPoint, point) in enumerate(points):
+            for entry in self.phaseStatistics:
+                if entry["compared"][iPoint]:
+                    result = (self.wordingFailed if entry["failed"][iPoint] else self.wordingPassed) + ' (%+.1f%%)' % (100*entry["slowdown"][iPoint])
+                elif entry["failed"][iPoint]:
+                    result = self.wordingFailed + ' (missing)'
+                else:
+                    result = self.wordingSkipped
+                self.testData.append([point + ' | ' + entry["phase"], '%.3f' % entry["source"][iPoint], '%.3f' % entry["target"][iPoint], result])
+
+    # Function to perform Memory check
+    # Every sweep point fails whose peak memory per rank grows beyond the tolerance relative to the stored reference profile
+    def performMemoryCheck(self):
+        referenced = np.isfinite(self.targetVector)
+        if not np.all(referenced):
+            self.testRemark = self.testRemark + ' | ' + str(int(np.sum(~referenced))) + ' sweep point(s) without benchmarked memory reference | '
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = (self.sourceVector - self.targetVector)/self.targetVector
+        self.errorNorm = float(np.max(growth[referenced], initial=0))
+        pointFailed = referenced & (growth >= self.suiteConfig["tolerance"])
+
+        # criteria for pass/fail
+        if not np.any(referenced) or np.any(pointFailed):
+            self.testResult = self.wordingFailed
+        else:
+            self.testResult = self.wordingPassed
+
+        # generate test data
+        self.testData = [['Test Type','Max Relative Growth', 'Configured Tolerance', 'Test Result'],
+                      [self.testType, self.errorNorm, self.suiteConfig["tolerance"], self.testResult]]
+        self.testData.append(['Sweep Point', 'Peak Memory/Rank [MiB]', 'Reference [MiB]', 'Point Result'])
+        for (iPoint, (iMPI, iOMP)) in enumerate(zip(self.systemUnderTest.mpi_processes, self.systemUnderTest.omp_processes)):
+            if referenced[iPoint]:
+                result = (self.wordingFailed if pointFailed[iPoint] else self.wordingPassed) + ' (%+.1f%%)' % (100*growth[iPoint])
+            else:
+                result = self.wordingSkipped + ' (no reference)'
+            self.testData.append(['m' + str(iMPI) + '_o' + str(iOMP), '%.1f' % self.sourceVector[iPoint], '%.1f' % self.targetVector[iPoint], result])
+
+    # Report the sweep point with the lowest solver time of the SUT and of the reference
+    def reportBestDecomposition(self, referenced):
+        points = ['m' + str(iMPI) + '_o' + str(iOMP) for (iMPI, iOMP) in zip(self.systemUnderTest.mpi_processes, self.systemUnderTest.omp_processes)]
+        if len(points) != len(self.sourceVector):
+            return
+        iBest = int(np.argmin(self.sourceVector))
+        referenceBest = '-'
+        if np.any(referenced):
+            iReferenceBest = int(np.nanargmin(self.targetVector))
+            referenceBest = points[iReferenceBest] + ' (%.3f s)' % self.targetVector[iReferenceBest]
+        self.testData.append(['Best Decomposition', points[iBest], '%.3f s' % self.sourceVector[iBest], 'Reference: ' + referenceBest])
+        self.testRemark = self.testRemark + ' | Best decomposition ' + points[iBest] + ' | '
+
+    # Decide every sweep point on its sample distribution
+    # A point fails if it is significantly slower than the reference (one-sided Mann-Whitney U test at perf_alpha) and its median
+    # slowdown exceeds the tolerance. With a single sample on one side, or too few samples for the test to ever reach perf_alpha,
+    # the minimum of the samples is compared against the tolerance. A point with a (near) zero reference time is inconclusive and skipped
+    def performStatisticalPerformanceCheck(self, samples, referenceSamples):
+        self.performanceStatistics = []
+        boolFailed = False
+        alpha = self.suiteConfig["perf_alpha"]
+        underpowered = set()            # sample sizes (sut, reference) for which the test cannot reach alpha
+        for (iPoint, (sample, reference)) in enumerate(zip(samples, referenceSamples)):
+            [median, iqr, minimum] = computeSampleStatistics(sample)
+            point = 'm' + str(self.systemUnderTest.mpi_processes[iPoint]) + '_o' + str(self.systemUnderTest.omp_processes[iPoint])
+            if len(reference) == 0:
+                self.performanceStatistics.append({
+                    "point": point, "median": median, "iqr": iqr, "min": minimum, "referenceMedian": float('nan'),
+                    "decision": 'no reference', "result": self.wordingSkipped
+                })
+                continue
+            [referenceMedian, referenceIqr, referenceMinimum] = computeSampleStatistics(reference)
+            if min(referenceMedian, referenceMinimum) < config.performanceReferenceMinTime:
+                self.performanceStatistics.append({
+                    "point": point, "median": median, "iqr": iqr, "min": minimum, "referenceMedian": referenceMedian,
+                    "decision": 'reference below %g s' % config.performanceReferenceMinTime, "result": self.wordingSkipped
+                })
+                continue
+            boolTestable = len(sample) > 1 and len(reference) > 1
+            if boolTestable and computeMannWhitneyMinPValue(len(sample), len(reference)) >= alpha:
+                underpowered.add((len(sample), len(reference)))
+                boolTestable = False
+            if boolTestable:
+                pValue = computeMannWhitneyPValue(sample, reference)
+                boolPointFailed = pValue < alpha and (median - referenceMedian)/referenceMedian >= self.suiteConfig["tolerance"]
+                decision = 'p=%.3g' % pValue
+            else:
+                boolPointFailed = (minimum - referenceMinimum)/referenceMinimum >= self.suiteConfig["tolerance"]
+                decision = 'min'
+            boolFailed = boolFailed or boolPointFailed
+            self.performanceStatistics.append({
+                "point": point, "median": median, "iqr": iqr, "min": minimum, "referenceMedian": referenceMedian,
+                "decision": decision, "result": self.wordingFailed if boolPointFailed else self.wordingPassed
+            })
+        for (numSamples, numReference) in sorted(underpowered):
+            minimumRepetitions = '%d' % computeMannWhitneyMinSamples(numReference, alpha) if alpha > 0 else 'no number of'
+            print('WARNING! MANN-WHITNEY TEST CANNOT REACH PERF_ALPHA=%g WITH %d AGAINST %d RUNS (MIN p=%.3g), USING THE MINIMUM AGAINST THE TOLERANCE. '
+                  '%s PERF_REPETITIONS NEEDED' % (alpha, numSamples, numReference, computeMannWhitneyMinPValue(numSamples, numReference), minimumRepetitions))
+        self.testResult = self.wordingFailed if boolFailed else self.wordingPassed
         
\ No newline at end of file
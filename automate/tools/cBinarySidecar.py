@@ -0,0 +1,98 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+
+# Class for a binary sidecar of reference data parsed from text files
+# The arrays are stored as .npy files next to a manifest of the source files and are memory-mapped on load
+class cBinarySidecar(object):
+    # Constructor
+    def __init__(self, sidecarDirectory):
+        self.sidecarDirectory = sidecarDirectory                                        # Folder holding the arrays and the manifest
+        self.manifestFile = os.path.join(self.sidecarDirectory, 'manifest.json')        # Description of the source files
+
+    # Compute the sha256 of a file
+    def hashFile(self, filename):
+        sha = hashlib.sha256()
+        with open(filename, 'rb') as file:
+            for block in iter(lambda: file.read(1024*1024), b''):
+                sha.update(block)
+        return sha.hexdigest()
+
+    # Check if the sidecar was generated from the given source files
+    # Files with unchanged size and mtime are trusted, otherwise their content hash is compared
+    def isValid(self, sourceFiles):
+        try:
+            with open(self.manifestFile) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return False
+        sources = manifest.get('sources', {})
+        if sorted(sources.keys()) != sorted([os.path.basename(filename) for filename in sourceFiles]):
+            return False
+        for filename in sourceFiles:
+            [size, mtime, sha] = sources[os.path.basename(filename)]
+            stat = os.stat(filename)
+            if stat.st_size != size:
+                return False
+            if stat.st_mtime_ns != mtime and self.hashFile(filename) != sha:
+                return False
+        return all([os.path.exists(os.path.join(self.sidecarDirectory, name + '.npy')) for name in manifest.get('arrays', [])])
+
+    # Load all arrays of the sidecar as read-only memory maps
+    def load(self):
+        with open(self.manifestFile) as file:
+            manifest = json.load(file)
+        return {name: np.load(os.path.join(self.sidecarDirectory, name + '.npy'), mmap_mode='r') for name in manifest['arrays']}
+
+    # Store the arrays together with the manifest of the source files
+    def store(self, sourceFiles, arrays):
+        parent = os.path.dirname(os.path.abspath(self.sidecarDirectory))
+        os.makedirs(parent, exist_ok=True)
+        # written to a temporary folder first, concurrent suites only ever see complete sidecars
+        tmpDirectory = self.sidecarDirectory + '.tmp_' + str(os.getpid())
+        shutil.rmtree(tmpDirectory, ignore_errors=True)
+        os.makedirs(tmpDirectory)
+        for name in arrays:
+            np.save(os.path.join(tmpDirectory, name + '.npy'), np.ascontiguousarray(arrays[name]))
+        sources = {}
+        for filename in sourceFiles:
+            stat = os.stat(filename)
+            sources[os.path.basename(filename)] = [stat.st_size, stat.st_mtime_ns, self.hashFile(filename)]
+        with open(os.path.join(tmpDirectory, 'manifest.json'), 'w') as file:
+            json.dump({'sources': sources, 'arrays': sorted(arrays.keys())}, file, indent=1)
+
+        oldDirectory = self.sidecarDirectory + '.old_' + str(os.getpid())
+        if os.path.isdir(self.sidecarDirectory):
+            os.rename(self.sidecarDirectory, oldDirectory)
+        try:
+            os.rename(tmpDirectory, self.sidecarDirectory)
+        except OSError:
+            shutil.rmtree(tmpDirectory, ignore_errors=True)
+        shutil.rmtree(oldDirectory, ignore_errors=True)
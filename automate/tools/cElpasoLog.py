@@ -0,0 +1,163 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import re
+from collections import deque
+
+# Project imports
+import automate.config as config
+
+# Class for a structured elPaSo log (*.log.0)
+# The whole log is streamed line by line once, only its head lines and last lines are kept.
+# The header of the log (the lines before the first section header "-- NAME ----") is metadata only.
+# Every other line of the form "<phase> [:|=] [d:][h:]m:s" becomes a node of the timing tree, nested by section header
+# and indentation. Phases repeated at the same place of the tree accumulate their time.
+# All other "<key> : <value>" lines are collected as metadata.
+class cElpasoLog(object):
+    patternSection = re.compile(r'^\s*-{2,}\s*([^-\s][^-]*?)\s*-{3,}\s*$')
+    patternTiming = re.compile(r'^([\s\-|+*>`]*)([A-Za-z][^:=]*?)\s*[:=]?\s+((?:\d+:){1,3}\d+(?:\.\d*)?|\d+(?:\.\d*)?\s*(?:s|sec|seconds))(?:\s|$)')
+    patternKeyValue = re.compile(r'^[\s\-|+*>`]*([A-Za-z][^:=]*?)\s*[:=]\s*(.+?)\s*$')
+
+    # Constructor
+    def __init__(self, logFile, numHeadLines=None, numTailLines=None):
+        self.logFile = logFile                                                                                  # path of the log
+        self.numHeadLines = config.elpasoLogHeadLines if numHeadLines is None else numHeadLines                 # lines kept from the start
+        self.numTailLines = config.elpasoLogTailLines if numTailLines is None else numTailLines                 # lines kept from the end
+        self.headLines = []                 # first lines of the log
+        self.tailLines = []                 # last lines of the log, disjoint from the head lines
+        self.boolComplete = False           # True if head and tail lines cover the whole log
+        self.timings = self.createNode('')  # root of the timing tree
+        self.metadata = {}                  # key/value pairs of the log
+
+        self.read()
+
+    # Stream the log once through the parser, keeping its head and last lines
+    def read(self):
+        with open(self.logFile, 'rb') as file:
+            self.parse(self.readLines(file))
+
+    # Yield the decoded lines of the file while recording the head and the last lines
+    def readLines(self, file):
+        tailLines = deque(maxlen=self.numTailLines)
+        numTailLines = 0
+        for line in file:
+            line = self.decodeLine(line)
+            if len(self.headLines) < self.numHeadLines:
+                self.headLines.append(line)
+            else:
+                tailLines.append(line)
+                numTailLines += 1
+            yield line
+        self.tailLines = list(tailLines)
+        self.boolComplete = numTailLines <= self.numTailLines
+
+    # Return the last lines of the log
+    def getLastLines(self):
+        return self.headLines + self.tailLines if self.boolComplete else self.tailLines
+
+    # Decode a raw log line, tolerating foreign encodings and line endings
+    def decodeLine(self, line):
+        return line.decode('utf-8', errors='replace').rstrip('\r\n')
+
+    # Return a new node of the timing tree
+    def createNode(self, name):
+        return {"name": name, "seconds": 0.0, "count": 0, "children": {}}
+
+    # Convert a duration ("d:h:m:s", "h:m:s", "m:s" or "<seconds> s") to seconds
+    def parseDuration(self, text):
+        text = text.strip()
+        if ':' not in text:
+            return float(re.match(r'\d+(?:\.\d*)?', text).group(0))
+        seconds = 0.0
+        for (field, factor) in zip(reversed(text.split(':')), [1, 60, 3600, 86400]):
+            seconds = seconds + float(field)*factor
+        return seconds
+
+    # Parse the lines into the timing tree and the metadata
+    def parse(self, lines):
+        stack = [(-1, self.timings)]    # open nodes with the indentation of their line
+        boolHeader = True               # header lines (e.g. "Date : 12:30:45") never become timings
+        for (iLine, line) in enumerate(lines):
+            if line.strip() == '':
+                continue
+            section = self.patternSection.match(line)
+            if section:
+                boolHeader = False
+                node = self.timings["children"].setdefault(section.group(1), self.createNode(section.group(1)))
+                stack = [(-1, self.timings), (-1, node)]
+                continue
+            boolHeader = boolHeader and iLine < self.numHeadLines
+            timing = None if boolHeader else self.patternTiming.match(line)
+            if timing:
+                indent = len(timing.group(1))
+                name = " ".join(timing.group(2).split())
+                while len(stack) > 1 and stack[-1][0] >= indent:
+                    stack.pop()
+                node = stack[-1][1]["children"].setdefault(name, self.createNode(name))
+                node["seconds"] = node["seconds"] + self.parseDuration(timing.group(3))
+                node["count"] = node["count"] + 1
+                stack.append((indent, node))
+                continue
+            keyValue = self.patternKeyValue.match(line)
+            if keyValue:
+                self.metadata[" ".join(keyValue.group(1).split())] = keyValue.group(2)
+
+    # Return the time of a phase in seconds or None if the log does not contain it
+    # The phase is a path of node names separated by '/' (e.g. "MODRED/solve system") or a single name searched in the whole tree
+    def getPhaseTime(self, phase):
+        node = self.findPhase(phase)
+        return None if node is None else node["seconds"]
+
+    # Return the node of a phase or None
+    def findPhase(self, phase):
+        names = [" ".join(name.split()).lower() for name in phase.split('/')]
+        # full path from the root
+        node = self.timings
+        for name in names:
+            node = next((child for child in node["children"].values() if child["name"].lower() == name), None)
+            if node is None:
+                break
+        if node is not None and node["count"]:
+            return node
+        # otherwise the first match in depth-first order
+        pending = list(self.timings["children"].values())
+        while len(pending) > 0:
+            node = pending.pop(0)
+            if node["name"].lower() == names[-1] and node["count"]:
+                return node
+            pending = list(node["children"].values()) + pending
+        return None
+
+    # Return all phases as a flat dictionary of path to seconds
+    def getPhaseTimes(self):
+        phases = {}
+        pending = [('', child) for child in self.timings["children"].values()]
+        while len(pending) > 0:
+            (prefix, node) = pending.pop(0)
+            path = prefix + node["name"]
+            if node["count"]:
+                phases[path] = node["seconds"]
+            pending = [(path + '/', child) for child in node["children"].values()] + pending
+        return phases
@@ -98,6 +98,25 @@ class cIssueGitLab:
                            "Please resolve the error and close the issue. In case of problems, seek help of main developers."
         self.assignee = self.current_user_id
         
+    # Set a AUTOMATE Issue | Memory
+    def setAutomateMemoryIssue(self, blist, buildcase):
+        self.title = "AUTOMATE Issue | Build Type: " + buildcase + " | Memory Test | " + self.commit_id
+        self.description = "This is an AUTOMATE generated issue during elPaSo CI run\n"+ \
+                           "There seems to be an error while automatic tests\n"+ \
+                           "                                                        \n"+ \
+                           "                                                        \n"+ \
+                           "Issue: Some memory test(s) did not pass\n"+ \
+                           "                                                        \n"+ \
+                           "Benchmarks: " + blist + "\n"+ \
+                           "                                                        \n"+ \
+                           "Assigned to: " + self.current_user.username + "\n"+ \
+                           "                                                        \n"+ \
+                           "Commit ID:   " + self.commit_id + " | Long: " + self.commit_idlong + "\n"+ \
+                           "                                                        \n"+ \
+                           "                                                        \n"+ \
+                           "Please resolve the error and close the issue. In case of problems, seek help of main developers."
+        self.assignee = self.current_user_id
+        
     # Report an issue
     # Author: Harikrishnan Sreekumar
     # Date: 28.07.2021
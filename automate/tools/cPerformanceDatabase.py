@@ -0,0 +1,110 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import json
+import sqlite3
+import datetime
+import numpy as np
+
+# Project imports
+import automate.config as config
+
+# Class for the local history of performance results
+# Every harness run is stored as a run (host, binary, commit, log metadata) with one row per suite and sweep point
+# holding the solver time, its samples, the resource usage and the log phase times. The database is a single
+# SQLite file and needs no server. Points that failed their check are stored but never used as history
+class cPerformanceDatabase(object):
+    resultFailed = 'FAILED'     # point result excluded from the history
+    # Constructor
+    def __init__(self, filename):
+        self.filename = filename                                                            # path of the database file
+        self.connection = sqlite3.connect(filename, timeout=config.performanceDatabaseTimeout)
+        self.connection.execute('PRAGMA journal_mode=WAL')                                  # readers are not blocked by the writer
+        self.createTables()
+
+    # Create the tables if the database is new
+    def createTables(self):
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS runs (run_id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, host TEXT, '
+                                    'binary TEXT, commit_id TEXT, metadata TEXT)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS points (run_id INTEGER REFERENCES runs(run_id), suite TEXT, test_type TEXT, '
+                                    'point TEXT, mpi INTEGER, omp INTEGER, solver_time REAL, samples TEXT, wall_time REAL, cpu_time REAL, '
+                                    'peak_memory REAL, phases TEXT, result TEXT)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS points_suite_point ON points (suite, point, run_id)')
+
+    # Close the database
+    def close(self):
+        self.connection.close()
+
+    # Add a harness run and return its id
+    def addRun(self, host, binary, commitId, metadata):
+        with self.connection:
+            cursor = self.connection.execute('INSERT INTO runs (timestamp, host, binary, commit_id, metadata) VALUES (?, ?, ?, ?, ?)',
+                                             (datetime.datetime.now().isoformat(timespec='seconds'), host, binary, commitId, json.dumps(metadata)))
+        return cursor.lastrowid
+
+    # Add all sweep points of an executed performance or memory suite to a run
+    def addSuite(self, runId, suite):
+        system = suite.systemUnderTest
+        rows = []
+        for (iPoint, (iMPI, iOMP)) in enumerate(zip(system.mpi_processes, system.omp_processes)):
+            samples = system.solvertimeSamples[iPoint] if iPoint < len(system.solvertimeSamples) else []
+            resources = system.resourceSamples[iPoint] if iPoint < len(system.resourceSamples) else []
+            logs = system.binaryLogSamples[iPoint] if iPoint < len(system.binaryLogSamples) else []
+            statistics = suite.performanceStatistics if suite.performanceStatistics is not None else []
+            result = statistics[iPoint]["result"] if iPoint < len(statistics) else suite.testResult
+            rows.append((runId, suite.suiteConfig["name"], suite.testType, 'm' + str(iMPI) + '_o' + str(iOMP), iMPI, iOMP,
+                         self.getMedian(samples), json.dumps(samples),
+                         self.getMedian([resource["wallTime"] for resource in resources]),
+                         self.getMedian([resource["cpuTime"] for resource in resources]),
+                         system.peakmemory[iPoint] if iPoint < len(system.peakmemory) else None,
+                         json.dumps(self.getMedianPhaseTimes(logs)), result))
+        with self.connection:
+            self.connection.executemany('INSERT INTO points VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    # Return the median of the values or None if there are none
+    def getMedian(self, values):
+        values = [value for value in values if value is not None and np.isfinite(value)]
+        return float(np.median(values)) if len(values) else None
+
+    # Return the median time of every phase over the logs of the repetitions
+    def getMedianPhaseTimes(self, logs):
+        phases = {}
+        for log in logs:
+            for (phase, seconds) in log.getPhaseTimes().items():
+                phases.setdefault(phase, []).append(seconds)
+        return {phase: self.getMedian(values) for (phase, values) in phases.items()}
+
+    # Return the latest values of a column for a suite and sweep point on a host, oldest first
+    # Failed points are skipped, a regression must not become the baseline it is checked against
+    def getHistory(self, suiteName, point, host, window, column='solver_time'):
+        if column not in ['solver_time', 'wall_time', 'cpu_time', 'peak_memory']:
+            raise ValueError('Unknown history column ' + column)
+        cursor = self.connection.execute('SELECT points.' + column + ' FROM points JOIN runs ON points.run_id = runs.run_id '
+                                         'WHERE points.suite = ? AND points.point = ? AND runs.host = ? AND points.' + column + ' IS NOT NULL '
+                                         'AND (points.result IS NULL OR points.result != ?) '
+                                         'ORDER BY points.run_id DESC LIMIT ?', (suiteName, point, host, self.resultFailed, window))
+        return [row[0] for row in cursor.fetchall()][::-1]
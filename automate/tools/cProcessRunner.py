@@ -0,0 +1,110 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import os
+import time
+import threading
+import subprocess
+
+# Project imports
+import automate.config as config
+
+# Class for running a system binary as a managed subprocess
+# Records wall time, user/system cpu time (rusage of the process and its waited-for descendants), the peak resident
+# set size of the largest process and the peak summed resident set size of the whole process tree (e.g. all mpi ranks).
+# The tree is sampled by following /proc/<pid>/task/<tid>/children from the root, other processes of the host are never read
+class cProcessRunner(object):
+    # Constructor
+    def __init__(self, samplingInterval=None):
+        self.samplingInterval = config.processSamplingInterval if samplingInterval is None else samplingInterval   # seconds between /proc samples
+        self.pageSize = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096                              # bytes per rss page
+        self.boolTreeSampling = os.path.exists('/proc/' + str(os.getpid()) + '/task/' + str(os.getpid()) + '/children')  # kernel lists child pids
+
+    # Run the shell command in the given working directory and return the resource usage
+    def run(self, command, cwd):
+        startTime = time.perf_counter()
+        process = subprocess.Popen(command, shell=True, cwd=cwd)
+
+        sampler = {"peakTreeRss": 0, "numSamples": 0, "finished": threading.Event()}
+        thread = None
+        if self.boolTreeSampling:
+            thread = threading.Thread(target=self.sampleProcessTree, args=(process.pid, sampler), daemon=True)
+            thread.start()
+
+        userTime = float('nan')
+        systemTime = float('nan')
+        maxRss = float('nan')
+        if hasattr(os, 'wait4'):
+            (_, status, rusage) = os.wait4(process.pid, 0)
+            # decoded like subprocess: exit code or the negative signal number
+            process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+            userTime = rusage.ru_utime
+            systemTime = rusage.ru_stime
+            maxRss = rusage.ru_maxrss*1024      # kilobytes on linux
+        else:
+            process.wait()
+        wallTime = time.perf_counter() - startTime
+
+        sampler["finished"].set()
+        if thread is not None:
+            thread.join()
+
+        return {
+            "command": command,
+            "cwd": cwd,
+            "exitStatus": process.returncode,
+            "wallTime": wallTime,
+            "userTime": userTime,
+            "systemTime": systemTime,
+            "cpuTime": userTime + systemTime,
+            "maxRss": maxRss,
+            "peakTreeRss": sampler["peakTreeRss"] if sampler["numSamples"] > 0 else float('nan'),
+            "numSamples": sampler["numSamples"]
+        }
+
+    # Sample the summed resident set size of the process tree below the root pid until the run finished
+    def sampleProcessTree(self, rootPid, sampler):
+        while not sampler["finished"].is_set():
+            rss = self.getProcessTreeRss(rootPid)
+            if rss > 0:
+                sampler["peakTreeRss"] = max(sampler["peakTreeRss"], rss)
+                sampler["numSamples"] = sampler["numSamples"] + 1
+            sampler["finished"].wait(self.samplingInterval)
+
+    # Return the summed resident set size in bytes of the process and all of its descendants
+    def getProcessTreeRss(self, rootPid):
+        rss = 0
+        pending = [rootPid]
+        while len(pending) > 0:
+            path = '/proc/' + str(pending.pop())
+            try:
+                with open(path + '/statm', 'rb') as file:
+                    rss = rss + int(file.read().split()[1])*self.pageSize     # resident pages
+                for task in os.listdir(path + '/task'):
+                    with open(path + '/task/' + task + '/children', 'rb') as file:
+                        pending.extend([int(child) for child in file.read().split()])
+            except (OSError, ValueError, IndexError):
+                continue    # process vanished meanwhile
+        return rss
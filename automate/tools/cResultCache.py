@@ -0,0 +1,120 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import os
+import glob
+import shutil
+import hashlib
+import time
+
+# Project imports
+from automate import config
+
+# Class for a persistent on-disk cache of solver results
+# Entries are addressed by a hash over the binary, the model files and the flags of the run
+class cResultCache(object):
+    # Constructor
+    def __init__(self, cacheDirectory):
+        self.cacheDirectory = cacheDirectory                                # Root folder of all cache entries
+        self.maxSizeBytes = config.resultCacheMaxSizeGB * 1024**3           # Entries are evicted beyond this size
+        self.maxAgeSeconds = config.resultCacheMaxAgeDays * 86400           # Entries older than this are evicted
+        self.resultPatterns = ['eGenOutput_*', 'eGenModRed_*', '*.log.*']    # Files of a run that are cached
+        self.fileHashes = {}                                                # Memoized hashes of unchanged files
+        if not os.path.exists(self.cacheDirectory):
+            os.makedirs(self.cacheDirectory, exist_ok=True)
+
+    # Update the hash with the content of a file
+    def hashFile(self, filename):
+        stat = os.stat(filename)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if filename in self.fileHashes and self.fileHashes[filename][0] == signature:
+            return self.fileHashes[filename][1]
+        sha = hashlib.sha256()
+        with open(filename, 'rb') as file:
+            for block in iter(lambda: file.read(1024*1024), b''):
+                sha.update(block)
+        self.fileHashes[filename] = (signature, sha.hexdigest())
+        return self.fileHashes[filename][1]
+
+    # Compute the cache key of a solver run
+    def computeKey(self, binaryFile, modelDirectory, systemFlags, solverFlags):
+        sha = hashlib.sha256()
+        sha.update(self.hashFile(binaryFile).encode())
+        for root, dirs, files in os.walk(modelDirectory):
+            dirs.sort()
+            for filename in sorted(files):
+                fullname = os.path.join(root, filename)
+                sha.update(os.path.relpath(fullname, modelDirectory).encode())
+                sha.update(self.hashFile(fullname).encode())
+        sha.update(('flags:' + systemFlags).encode())
+        sha.update(('solver:' + solverFlags).encode())
+        return sha.hexdigest()
+
+    # Copy the cached results of a key to the computation folder. Returns True on a hit
+    def restoreResults(self, key, computepath):
+        entry = os.path.join(self.cacheDirectory, key)
+        if not os.path.isdir(entry):
+            return False
+        for filename in os.listdir(entry):
+            shutil.copy2(os.path.join(entry, filename), computepath)
+        os.utime(entry)     # recently used entries are evicted last
+        return True
+
+    # Store the results of the computation folder under a key
+    def storeResults(self, key, computepath):
+        entry = os.path.join(self.cacheDirectory, key)
+        if os.path.isdir(entry):
+            return
+        # written to a temporary folder first, concurrent suites only ever see complete entries
+        tmpEntry = os.path.join(self.cacheDirectory, 'tmp_' + key + '_' + str(os.getpid()))
+        os.makedirs(tmpEntry)
+        for pattern in self.resultPatterns:
+            for filename in glob.glob(os.path.join(computepath, pattern)):
+                shutil.copy2(filename, tmpEntry)
+        try:
+            os.rename(tmpEntry, entry)
+        except OSError:
+            shutil.rmtree(tmpEntry, ignore_errors=True)
+        self.evictEntries()
+
+    # Return the size of an entry in bytes
+    def getEntrySize(self, entry):
+        return sum([os.path.getsize(os.path.join(entry, filename)) for filename in os.listdir(entry)])
+
+    # Evict entries by age and afterwards the least recently used ones until the size limit is met
+    def evictEntries(self):
+        entries = []
+        for name in os.listdir(self.cacheDirectory):
+            entry = os.path.join(self.cacheDirectory, name)
+            if os.path.isdir(entry) and not name.startswith('tmp_'):
+                entries.append([os.path.getmtime(entry), self.getEntrySize(entry), entry])
+        entries.sort()
+
+        now = time.time()
+        totalSize = sum([size for (_, size, _) in entries])
+        for (mtime, size, entry) in entries:
+            if now - mtime > self.maxAgeSeconds or totalSize > self.maxSizeBytes:
+                shutil.rmtree(entry, ignore_errors=True)
+                totalSize -= size
@@ -0,0 +1,98 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import os
+import shutil
+import fnmatch
+
+# Project imports
+from automate import config
+
+FICLONE = 0x40049409    # ioctl request for copy-on-write clones on linux (btrfs, xfs, ...)
+
+# Class for staging benchmark inputs into calculation folders
+# Files are reflinked or hardlinked where the filesystem allows it and copied otherwise
+# Files the run may write (config.stagingMaterializePatterns) are never hardlinked to protect the benchmark tree
+class cStaging(object):
+    # Constructor
+    def __init__(self):
+        self.bytesStaged = 0        # Size of all staged files
+        self.bytesSaved = 0         # Size of the staged files that were not duplicated on disk
+
+    # Stage the content of the source folder into the target folder (similar to cp -r source/. target)
+    def stageDirectory(self, source, target):
+        for root, dirs, files in os.walk(source):
+            targetRoot = os.path.join(target, os.path.relpath(root, source))
+            os.makedirs(targetRoot, exist_ok=True)
+            for filename in files:
+                self.stageFile(os.path.join(root, filename), os.path.join(targetRoot, filename))
+
+    # Stage a single file
+    def stageFile(self, source, target):
+        if os.path.lexists(target):
+            os.remove(target)
+        size = os.path.getsize(source)
+        self.bytesStaged += size
+        # copy-on-write clones are independent of the source and safe for every file
+        if self.reflinkFile(source, target) or (not self.isWrittenBySolver(source) and self.hardlinkFile(source, target)):
+            self.bytesSaved += size
+            return
+        shutil.copy2(source, target)
+
+    # Check if a file is written to in place and therefore has to be materialized
+    def isWrittenBySolver(self, filename):
+        for pattern in config.stagingMaterializePatterns:
+            if fnmatch.fnmatch(os.path.basename(filename), pattern):
+                return True
+        return False
+
+    # Create a copy-on-write clone. Returns False if the filesystem does not support it
+    def reflinkFile(self, source, target):
+        try:
+            import fcntl
+        except ImportError:
+            return False
+        try:
+            with open(source, 'rb') as sourceFile, open(target, 'wb') as targetFile:
+                fcntl.ioctl(targetFile.fileno(), FICLONE, sourceFile.fileno())
+        except OSError:
+            if os.path.lexists(target):
+                os.remove(target)
+            return False
+        shutil.copystat(source, target)
+        return True
+
+    # Create a hardlink. Returns False if the filesystem does not support it (e.g. across devices)
+    # The link shares the inode (and mode) with the source, it is left untouched
+    def hardlinkFile(self, source, target):
+        try:
+            os.link(source, target)
+        except (OSError, AttributeError):
+            return False
+        return True
+
+    # Returns a summary of the staged data
+    def getSummaryString(self):
+        return ('{:.1f} MB staged, {:.1f} MB saved by linking'.format(self.bytesStaged/1024**2, self.bytesSaved/1024**2))
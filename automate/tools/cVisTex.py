@@ -105,6 +105,20 @@ class cVisTex(cVisInterface):
         plt.savefig("{:s}/plots/{:s}.png".format(outputdir, outputname), bbox_inches='tight', dpi=200)
         return "{:s}/plots/{:s}.png"
 
+    # Generate Memory Plot - peak memory per rank over the sweep
+    def generateMemoryPlot(self, outputdir, outputname, xdata, ydata_set1, ydata_set2):
+        fig1 = plt.figure()
+        plt.plot(xdata,ydata_set1,'ro--', label = 'SUT')
+        plt.plot(xdata,ydata_set2,'bX--', label = 'SyT')
+        plt.legend()
+        plt.title('Memory scaling plot')
+        plt.grid()
+        plt.xlabel('# processes/threads')
+        plt.ylabel('Peak memory per rank in MiB')
+        plt.savefig("{:s}/plots/{:s}.png".format(outputdir, outputname), bbox_inches='tight', dpi=200)
+        plt.close()
+        return "{:s}/plots/{:s}.png"
+
     def createHeader(self,Heading):
         self.pdf = PDF()
         self.pdf.add_page()
@@ -316,6 +330,9 @@ class cVisTex(cVisInterface):
                 elif suite.testType in suite.wordingPerformance:
                     plot = self.generatePerformancePlot(output_folder, suite.suiteConfig["name"], suite.systemUnderTest.thread_vector,
                                             suite.sourceVector, suite.targetVector)                     
+                elif suite.testType in suite.wordingMemory:
+                    plot = self.generateMemoryPlot(output_folder, suite.suiteConfig["name"], suite.systemUnderTest.thread_vector,
+                                            suite.sourceVector, suite.targetVector)
                 suite.plots.append(plot)
             self.createHeader(suite.suiteConfig["name"])
             self.createTestcaseBody(output_folder,suite)
@@ -0,0 +1,65 @@
+# Copyright (c) 2023. Authors listed in AUTHORS.md
+#
+# This file is part of elPaSo-AUTOMATE.
+#
+# elPaSo-AUTOMATE is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version.
+#
+# elPaSo-AUTOMATE is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with elPaSo-AUTOMATE (COPYING.txt). If not, see
+# <https://www.gnu.org/licenses/>. 
+
+## AUTOMATE Automated Testing Framework for elPaSo
+## The current file is a part of AUTOMATE code package
+##
+## Authors: Harikrishnan Sreekumar, Christopher Blech
+## Property of : Institut für Akustik, TU Braunschweig, Germany
+
+# Basic imports
+import os
+
+# Returns the number of physical cores available to the process (hyperthreads of a core are counted once)
+# Falls back to the number of logical cpus if the topology is not exposed
+def getPhysicalCoreCount():
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    cores = set()
+    for cpu in cpus:
+        topology = '/sys/devices/system/cpu/cpu' + str(cpu) + '/topology/'
+        try:
+            with open(topology + 'physical_package_id') as file:
+                package = file.read().strip()
+            with open(topology + 'core_id') as file:
+                core = file.read().strip()
+        except OSError:
+            return max(1, len(cpus))
+        cores.add((package, core))
+    return max(1, len(cores))
+
+# Returns the process counts of a sweep specification bounded by maxCores
+# The specification is 'pow2' (1, 2, 4, ... up to maxCores) or a comma separated list of counts and ranges, e.g. '1,2,6-8'
+def parseSweepCounts(specification, maxCores):
+    counts = set()
+    if specification.strip() == 'pow2':
+        count = 1
+        while count <= maxCores:
+            counts.add(count)
+            count = count*2
+        return sorted(counts)
+    for token in specification.split(','):
+        token = token.strip()
+        if '-' in token:
+            [first, last] = token.split('-')
+            counts.update(range(int(first), int(last)+1))
+        elif token != '':
+            counts.add(int(token))
+    return sorted([count for count in counts if count <= maxCores])